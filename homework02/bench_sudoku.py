@@ -0,0 +1,134 @@
+"""Бенчмарк движков решения судоку на пазлах из репозитория и сгенерированных наборах.
+
+Пример:
+    python bench_sudoku.py --output bench.json
+    python bench_sudoku.py --engines bitmask iterative --baseline bench.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import pathlib
+import random
+import statistics
+import sys
+import time
+import typing as tp
+
+import sudoku
+
+Grid = tp.List[tp.List[str]]
+
+FILE_CORPORA = {
+    "puzzles": ["puzzle1.txt", "puzzle2.txt", "puzzle3.txt"],
+    "hard_puzzles": ["hard_puzzles.txt"],
+}
+
+
+def load_corpora(count: int, seed: int) -> tp.Dict[str, tp.List[Grid]]:
+    """Пазлы из файлов и сгенерированные наборы по count пазлов каждой сложности"""
+    here = pathlib.Path(__file__).parent
+    corpora = {
+        name: [grid for fname in files for grid in sudoku.read_puzzles(here / fname)]
+        for name, files in FILE_CORPORA.items()
+    }
+    rng = random.Random(seed)
+    for difficulty, (low, high) in sudoku.DIFFICULTY_CLUES.items():
+        corpora[f"generated_{low}-{high}_clues"] = [
+            sudoku.generate_unique_sudoku(difficulty, rng) for _ in range(count)
+        ]
+    return corpora
+
+
+def percentile(values: tp.List[float], q: float) -> float:
+    """Перцентиль q (от 0 до 100) методом ближайшего ранга"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(len(ordered) * q / 100 + 0.5) - 1))]
+
+
+def bench_corpus(engine: str, puzzles: tp.List[Grid]) -> tp.Dict[str, float]:
+    """Решить все пазлы набора движком engine и посчитать статистику времени и узлов"""
+    times, nodes = [], []
+    for puzzle in puzzles:
+        stats = sudoku.SolverStats()
+        solution = sudoku.solve([row[:] for row in puzzle], engine, stats=stats)
+        if solution is None or not sudoku.check_solution(solution):
+            raise RuntimeError(f"Engine {engine} returned a wrong solution")
+        times.append(stats.wall_time)
+        nodes.append(stats.nodes)
+    return {
+        "puzzles": len(puzzles),
+        "median_ms": statistics.median(times) * 1000,
+        "p99_ms": percentile(times, 99) * 1000,
+        "mean_nodes": statistics.mean(nodes),
+        "puzzles_per_s": len(puzzles) / sum(times) if sum(times) else float("inf"),
+    }
+
+
+def run(
+    engines: tp.List[str], corpora: tp.Dict[str, tp.List[Grid]], timeout: float
+) -> tp.Dict[str, tp.Dict[str, tp.Dict[str, tp.Any]]]:
+    """Прогнать каждый движок на каждом наборе в отдельном процессе.
+    Для набора, не уложившегося в timeout секунд, вместо статистики записывается timeout"""
+    results: tp.Dict[str, tp.Dict[str, tp.Dict[str, tp.Any]]] = {}
+    for engine in engines:
+        results[engine] = {}
+        for name, puzzles in corpora.items():
+            with multiprocessing.Pool(1) as pool:
+                job = pool.apply_async(bench_corpus, (engine, puzzles))
+                try:
+                    results[engine][name] = job.get(timeout)
+                except multiprocessing.TimeoutError:
+                    results[engine][name] = {"puzzles": len(puzzles), "timeout": timeout}
+    return results
+
+
+def regressions(
+    results: tp.Dict[str, tp.Dict[str, tp.Dict[str, tp.Any]]],
+    baseline: tp.Dict[str, tp.Dict[str, tp.Dict[str, tp.Any]]],
+    tolerance: float,
+) -> tp.List[str]:
+    """Наборы, где медианное время выросло больше чем в tolerance раз относительно baseline"""
+    found = []
+    for engine, corpora in results.items():
+        for name, result in corpora.items():
+            before = baseline.get(engine, {}).get(name, {})
+            if "median_ms" not in before:
+                continue
+            if "median_ms" not in result:
+                found.append(f"{engine}/{name}: timeout, was {before['median_ms']:.3f} ms")
+            elif result["median_ms"] > before["median_ms"] * tolerance:
+                found.append(f"{engine}/{name}: {result['median_ms']:.3f} ms, was {before['median_ms']:.3f} ms")
+    return found
+
+
+def main(argv: tp.Optional[tp.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк движков решения судоку")
+    parser.add_argument("--engines", nargs="+", choices=sorted(sudoku.ENGINES), default=sorted(sudoku.ENGINES))
+    parser.add_argument("--count", type=int, default=50, help="пазлов в каждом сгенерированном наборе")
+    parser.add_argument("--seed", type=int, default=102)
+    parser.add_argument("--timeout", type=float, default=60.0, help="секунд на один движок и набор")
+    parser.add_argument("--output", help="файл для результатов в JSON (по умолчанию stdout)")
+    parser.add_argument("--baseline", help="JSON прошлого запуска для поиска регрессий")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="допустимое замедление медианы, раз")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run(args.engines, load_corpora(args.count, args.seed), args.timeout)
+    report = json.dumps(results, indent=2)
+    if args.output:
+        pathlib.Path(args.output).write_text(report)
+    else:
+        print(report)
+    print(f"Done in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+    if args.baseline:
+        found = regressions(results, json.loads(pathlib.Path(args.baseline).read_text()), args.tolerance)
+        for line in found:
+            print(f"Regression: {line}", file=sys.stderr)
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
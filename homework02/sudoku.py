@@ -1,9 +1,64 @@
+import argparse
+import collections
+import csv
+import dataclasses
+import functools
+import itertools
+import json
+import multiprocessing
 import pathlib
+import random
+import shelve
+import time
 import typing as tp
-from random import randint
+
+import numpy as np
 
 T = tp.TypeVar("T")
 
+# Алфавит символов: поле size x size использует первые size символов
+SYMBOLS = "123456789ABCDEFGHIJKLMNOP"
+
+# Диапазоны числа подсказок для каждого уровня сложности
+DIFFICULTY_CLUES = {
+    "easy": (36, 45),
+    "medium": (30, 35),
+    "hard": (25, 29),
+}
+
+# Меньше подсказок не бывает у судоку 9x9 с единственным решением; у более пустых полей
+# каноническая форма перебирает миллионы вариантов, и кэш решает их дольше самого движка
+MIN_CACHED_CLUES = 17
+
+
+@dataclasses.dataclass
+class SolverStats:
+    """Статистика одного решения: число узлов перебора, откатов, значений, выведенных
+    распространением ограничений, максимальная глубина перебора и время решения в секундах"""
+
+    nodes: int = 0
+    backtracks: int = 0
+    propagations: int = 0
+    max_depth: int = 0
+    wall_time: float = 0.0
+    depth: int = dataclasses.field(default=0, repr=False)
+
+    def push(self) -> None:
+        self.nodes += 1
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+
+    def pop(self, undone: bool = True) -> None:
+        """Выйти из узла перебора; откатом считается только ветвь, не давшая решения"""
+        self.depth -= 1
+        if undone:
+            self.backtracks += 1
+
+    def as_dict(self) -> tp.Dict[str, tp.Union[int, float]]:
+        record = dataclasses.asdict(self)
+        del record["depth"]
+        return record
+
 
 def read_sudoku(path: tp.Union[str, pathlib.Path]) -> tp.List[tp.List[str]]:
     """Прочитать Судоку из указанного файла"""
@@ -13,19 +68,44 @@ def read_sudoku(path: tp.Union[str, pathlib.Path]) -> tp.List[tp.List[str]]:
     return create_grid(puzzle)
 
 
+def get_symbols(size: int) -> str:
+    """Вернуть алфавит символов для поля size x size
+    >>> get_symbols(9)
+    '123456789'
+    >>> get_symbols(16)
+    '123456789ABCDEFG'
+    """
+    box = int(size**0.5)
+    if box * box != size or size > len(SYMBOLS):
+        raise ValueError(f"Unsupported sudoku size: {size}")
+    return SYMBOLS[:size]
+
+
 def create_grid(puzzle: str) -> tp.List[tp.List[str]]:
-    digits = [c for c in puzzle if c in "123456789."]
-    grid = group(digits, 9)
+    """Размер поля определяется по числу клеток: 81, 256 или 625
+    >>> len(create_grid("." * 256))
+    16
+    """
+    digits = [c for c in puzzle if c in SYMBOLS + "."]
+    size = int(len(digits) ** 0.5)
+    grid = group(digits, size)
     return grid
 
 
 def display(grid: tp.List[tp.List[str]]) -> None:
     """Вывод Судоку"""
+    size = len(grid)
+    box = int(size**0.5)
     width = 2
-    line = "+".join(["-" * (width * 3)] * 3)
-    for row in range(9):
-        print("".join(grid[row][col].center(width) + ("|" if str(col) in "25" else "") for col in range(9)))
-        if str(row) in "25":
+    line = "+".join(["-" * (width * box)] * box)
+    for row in range(size):
+        print(
+            "".join(
+                grid[row][col].center(width) + ("|" if col % box == box - 1 and col != size - 1 else "")
+                for col in range(size)
+            )
+        )
+        if row % box == box - 1 and row != size - 1:
             print(line)
     print()
 
@@ -116,12 +196,54 @@ def find_possible_values(grid: tp.List[tp.List[str]], pos: tp.Tuple[int, int]) -
     row = get_row(grid, pos)
     col = get_col(grid, pos)
     block = get_block(grid, pos)
-    possible_values = set("123456789") - set(row) - set(col) - set(block) - {"."}
+    possible_values = set(get_symbols(len(grid))) - set(row) - set(col) - set(block) - {"."}
     return possible_values
 
 
-def solve(grid: tp.List[tp.List[str]]) -> tp.Optional[tp.List[tp.List[str]]]:
-    """Решение пазла, заданного в grid"""
+def solve(
+    grid: tp.List[tp.List[str]],
+    engine: str = "backtracking",
+    cache: tp.Optional["SolutionCache"] = None,
+    stats: tp.Optional[SolverStats] = None,
+) -> tp.Optional[tp.List[tp.List[str]]]:
+    """Решение пазла, заданного в grid, одним из движков ENGINES.
+    Если передан cache, решения симметричных вариантов уже решённых пазлов берутся из него.
+    Если передан stats, в него записывается статистика перебора и время решения"""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    if stats is None:
+        return _solve_cached(grid, ENGINES[engine], cache, None)
+    start = time.perf_counter()
+    solution = _solve_cached(grid, ENGINES[engine], cache, stats)
+    stats.wall_time += time.perf_counter() - start
+    return solution
+
+
+def _solve_cached(
+    grid: tp.List[tp.List[str]],
+    engine: "Engine",
+    cache: tp.Optional["SolutionCache"],
+    stats: tp.Optional[SolverStats],
+) -> tp.Optional[tp.List[tp.List[str]]]:
+    if cache is None or len(grid) != 9:
+        return engine(grid, stats)
+    clues = sum(v != "." for row in grid for v in row)
+    if clues < MIN_CACHED_CLUES or clues == 81:
+        return engine(grid, stats)
+    key, transform = canonical_form(grid)
+    cached = cache.get(key)
+    if cached is not None:
+        return invert_transform(group(list(cached), 9), transform)
+    solution = engine(grid, stats)
+    if solution:
+        cache.put(key, "".join(c for row in apply_transform(solution, transform) for c in row))
+    return solution
+
+
+def solve_backtracking(
+    grid: tp.List[tp.List[str]], stats: tp.Optional[SolverStats] = None
+) -> tp.Optional[tp.List[tp.List[str]]]:
+    """Решение пазла перебором с возвратом"""
     """ Как решать Судоку?
         1. Найти свободную позицию
         2. Найти все возможные значения, которые могут находиться на этой позиции
@@ -140,10 +262,14 @@ def solve(grid: tp.List[tp.List[str]]) -> tp.Optional[tp.List[tp.List[str]]]:
     res = None
     for val in possible_values:
         grid[r][c] = val
-        res = solve(grid)
+        if stats is not None:
+            stats.push()
+        res = solve_backtracking(grid, stats)
         if res:
             return res
         grid[r][c] = "."
+        if stats is not None:
+            stats.pop()
     return res
 
 
@@ -161,15 +287,68 @@ def check_solution(solution: tp.List[tp.List[str]]) -> bool:
         if "." in col or len(col) != len(set(col)):
             return False
 
-    for r in range(0, len(solution), 3):
-        for c in range(0, len(solution), 3):
+    box = int(len(solution) ** 0.5)
+    for r in range(0, len(solution), box):
+        for c in range(0, len(solution), box):
             block = get_block(solution, (r, c))
-            if len(block) != len(set(block)):
+            if "." in block or len(block) != len(set(block)):
                 return False
     return True
 
 
-def generate_sudoku(N: int) -> tp.List[tp.List[str]]:
+def solutions_to_array(solutions: tp.Iterable[tp.Union[str, tp.List[tp.List[str]]]], size: int = 9) -> np.ndarray:
+    """Упаковать решения (строки или сетки) в массив (N, size, size) типа uint8,
+    где символы заменены номерами 1..size, а "." и посторонние символы — нулём
+    >>> solutions_to_array(["1234341221434321"], size=4)[0, 1]
+    array([3, 4, 1, 2], dtype=uint8)
+    """
+    lookup = np.zeros(256, dtype=np.uint8)
+    for i, symbol in enumerate(get_symbols(size), 1):
+        lookup[ord(symbol)] = i
+    data = "".join(
+        "".join(solution.split()) if isinstance(solution, str) else "".join(c for row in solution for c in row)
+        for solution in solutions
+    )
+    codes = np.frombuffer(data.encode("ascii", errors="replace"), dtype=np.uint8)
+    return lookup[codes].reshape(-1, size, size)
+
+
+def read_solutions(path: tp.Union[str, pathlib.Path], size: int = 9) -> np.ndarray:
+    """Прочитать файл с решениями (по size * size символов, пробельные символы игнорируются)
+    в массив (N, size, size) типа uint8"""
+    path = pathlib.Path(path)
+    with path.open() as f:
+        return solutions_to_array([f.read()], size)
+
+
+def check_solutions(solutions: np.ndarray, chunk_size: int = 1 << 16) -> np.ndarray:
+    """Векторная проверка пачки решений (N, size, size): вернуть булеву маску верных решений
+    >>> grids = solutions_to_array([solve(read_sudoku('puzzle1.txt')), read_sudoku('puzzle1.txt')])
+    >>> check_solutions(grids)
+    array([ True, False])
+    """
+    # Каждая клетка превращается в бит 1 << value; строка, столбец или квадрат верны, если OR их битов
+    # содержит все биты 1..size: size клеток могут покрыть size битов, только если значения различны
+    size = solutions.shape[1]
+    box = int(size**0.5)
+    full = np.uint32(((1 << size) - 1) << 1)
+    mask = np.empty(len(solutions), dtype=bool)
+    for start in range(0, len(solutions), chunk_size):
+        bits = np.left_shift(np.uint32(1), solutions[start : start + chunk_size], dtype=np.uint32)
+        boxes = bits.reshape(-1, box, box, box, box).transpose(0, 1, 3, 2, 4).reshape(-1, size, size)
+        units = np.concatenate(
+            (
+                np.bitwise_or.reduce(bits, axis=2),
+                np.bitwise_or.reduce(bits, axis=1),
+                np.bitwise_or.reduce(boxes, axis=2),
+            ),
+            axis=1,
+        )
+        mask[start : start + chunk_size] = (units == full).all(axis=1)
+    return mask
+
+
+def generate_sudoku(N: int, size: int = 9) -> tp.List[tp.List[str]]:
     """Генерация судоку заполненного на N элементов
     >>> grid = generate_sudoku(40)
     >>> sum(1 for row in grid for e in row if e == '.')
@@ -191,32 +370,578 @@ def generate_sudoku(N: int) -> tp.List[tp.List[str]]:
     True
     """
 
-    N = N if 0 <= N <= 81 else 81
-    new_grid = [
-        ["5", "3", "4", "6", "7", "8", "9", "1", "2"],
-        ["6", "7", "2", "1", "9", "5", "3", "4", "8"],
-        ["1", "9", "8", "3", "4", "2", "5", "6", "7"],
-        ["8", "5", "9", "7", "6", "1", "4", "2", "3"],
-        ["4", "2", "6", "8", "5", "3", "7", "9", "1"],
-        ["7", "1", "3", "9", "2", "4", "8", "5", "6"],
-        ["9", "6", "1", "5", "3", "7", "2", "8", "4"],
-        ["2", "8", "7", "4", "1", "9", "6", "3", "5"],
-        ["3", "4", "5", "2", "8", "6", "1", "7", "9"],
-    ]
-    for _ in range(81 - N):
-        r, c = randint(0, 8), randint(0, 8)
-        while new_grid[r][c] == ".":
-            r, c = randint(0, 8), randint(0, 8)
+    cells = size * size
+    N = N if 0 <= N <= cells else cells
+    new_grid = shuffle_grid(_base_solution(size))
+    for r, c in random.sample([(r, c) for r in range(size) for c in range(size)], cells - N):
         new_grid[r][c] = "."
     return new_grid
 
 
-if __name__ == "__main__":
-    for fname in ["puzzle1.txt", "puzzle2.txt", "puzzle3.txt"]:
-        grid = read_sudoku(fname)
-        display(grid)
-        solution = solve(grid)
-        if not solution:
-            print(f"Puzzle {fname} can't be solved")
+def _base_solution(size: int) -> tp.List[tp.List[str]]:
+    """Построить заведомо верное решённое судоку размера size x size"""
+    box = int(size**0.5)
+    symbols = get_symbols(size)
+    return [[symbols[(box * (r % box) + r // box + c) % size] for c in range(size)] for r in range(size)]
+
+
+def shuffle_grid(grid: tp.List[tp.List[str]], rng: tp.Optional[random.Random] = None) -> tp.List[tp.List[str]]:
+    """Случайно перемешать судоку, сохраняя корректность: переставить полосы, стеки,
+    строки внутри полос, столбцы внутри стеков, цифры, и, возможно, транспонировать
+    >>> solution = solve(read_sudoku('puzzle1.txt'))
+    >>> check_solution(shuffle_grid(solution))
+    True
+    """
+    rng = rng or random.Random(random.getrandbits(64))
+    size = len(grid)
+    box = int(size**0.5)
+
+    def permutation() -> tp.List[int]:
+        bands = rng.sample(range(box), box)
+        return [band * box + line for band in bands for line in rng.sample(range(box), box)]
+
+    rows, cols = permutation(), permutation()
+    digits = [c for row in grid for c in row if c != "."]
+    symbols = sorted(set(digits))
+    mapping = dict(zip(symbols, rng.sample(symbols, len(symbols))))
+    mapping["."] = "."
+    shuffled = [[mapping[grid[r][c]] for c in cols] for r in rows]
+    if rng.random() < 0.5:
+        shuffled = [list(col) for col in zip(*shuffled)]
+    return shuffled
+
+
+class _Layout(tp.NamedTuple):
+    units: tp.List[tp.List[int]]
+    peers: tp.List[tp.List[int]]
+    segments: tp.List[tp.List[int]]
+    locks: tp.List[tp.List[tp.Tuple[int, tp.List[int]]]]
+
+
+@functools.lru_cache(maxsize=None)
+def _layout(size: int) -> _Layout:
+    """Разметка поля size x size: клетки каждой строки, столбца и квадрата, соседи каждой клетки,
+    отрезки пересечения строк и столбцов с квадратами и, для каждого разбиения строки, столбца
+    или квадрата на отрезки, клетки пересекающего отрезок блока вне отрезка"""
+    box = int(size**0.5)
+    rows = [[r * size + c for c in range(size)] for r in range(size)]
+    cols = [[r * size + c for r in range(size)] for c in range(size)]
+    boxes = [
+        [(br + r) * size + bc + c for r in range(box) for c in range(box)]
+        for br in range(0, size, box)
+        for bc in range(0, size, box)
+    ]
+    units = rows + cols + boxes
+    peers: tp.List[tp.Set[int]] = [set() for _ in range(size * size)]
+    for unit in units:
+        for cell in unit:
+            peers[cell].update(unit)
+
+    segments: tp.List[tp.List[int]] = []
+    locks: tp.List[tp.List[tp.Tuple[int, tp.List[int]]]] = []
+    box_locks: tp.List[tp.List[tp.Tuple[int, tp.List[int]]]] = [[] for _ in range(2 * size)]
+    for index, line in enumerate(rows + cols):
+        is_col, i = divmod(index, size)
+        line_lock = []
+        for start in range(0, size, box):
+            segment = line[start : start + box]
+            b = start // box * box + i // box if is_col else i // box * box + start // box
+            sid = len(segments)
+            segments.append(segment)
+            line_lock.append((sid, [cell for cell in boxes[b] if cell not in segment]))
+            box_locks[b + size * is_col].append((sid, [cell for cell in line if cell not in segment]))
+        locks.append(line_lock)
+    locks.extend(box_locks)
+    return _Layout(units, [sorted(cell_peers - {cell}) for cell, cell_peers in enumerate(peers)], segments, locks)
+
+
+def _propagate(
+    candidates: tp.List[int],
+    values: tp.List[int],
+    queue: tp.List[tp.Tuple[int, int]],
+    layout: _Layout,
+    stats: tp.Optional[SolverStats] = None,
+) -> bool:
+    """Поставить значения из queue и распространить ограничения: исключить значение у соседей,
+    поставить единственных кандидатов в клетках и единственные места для цифры в строке, столбце, квадрате,
+    исключить цифры, запертые на пересечении строки или столбца с квадратом.
+    Возвращает False при противоречии"""
+    full = (1 << len(layout.units[0])) - 1
+    placed = -len(queue)
+    while True:
+        while queue:
+            cell, bit = queue.pop()
+            if values[cell]:
+                if values[cell] != bit:
+                    return False
+                continue
+            if not candidates[cell] & bit:
+                return False
+            values[cell] = candidates[cell] = bit
+            placed += 1
+            for peer in layout.peers[cell]:
+                mask = candidates[peer]
+                if mask & bit:
+                    mask ^= bit
+                    if not mask:
+                        return False
+                    candidates[peer] = mask
+                    if not mask & (mask - 1):
+                        queue.append((peer, mask))
+
+        for unit in layout.units:
+            once = twice = 0
+            for cell in unit:
+                mask = candidates[cell]
+                twice |= once & mask
+                once |= mask
+            if once != full:
+                return False
+            hidden = once & ~twice
+            if hidden:
+                for cell in unit:
+                    mask = candidates[cell] & hidden
+                    if mask and not values[cell]:
+                        if mask & (mask - 1):
+                            return False
+                        queue.append((cell, mask))
+        if queue:
+            continue
+
+        segment_masks = [0] * len(layout.segments)
+        for sid, segment in enumerate(layout.segments):
+            for cell in segment:
+                if not values[cell]:
+                    segment_masks[sid] |= candidates[cell]
+        changed = False
+        for lock in layout.locks:
+            for sid, targets in lock:
+                locked = segment_masks[sid]
+                for other, _ in lock:
+                    if other != sid:
+                        locked &= ~segment_masks[other]
+                if not locked:
+                    continue
+                for cell in targets:
+                    mask = candidates[cell]
+                    if mask & locked and not values[cell]:
+                        mask &= ~locked
+                        if not mask:
+                            return False
+                        candidates[cell] = mask
+                        changed = True
+                        if not mask & (mask - 1):
+                            queue.append((cell, mask))
+        if not changed:
+            if stats is not None:
+                stats.propagations += placed
+            return True
+
+
+def _bitmask_search(
+    grid: tp.List[tp.List[str]], limit: int = 1, stats: tp.Optional[SolverStats] = None
+) -> tp.Tuple[int, tp.Optional[tp.List[tp.List[str]]]]:
+    """Поиск решений на битовых масках кандидатов с распространением ограничений и ветвлением
+    по клетке с наименьшим числом кандидатов (MRV).
+    Возвращает число найденных решений (не больше limit) и первое найденное решение"""
+    size = len(grid)
+    symbols = get_symbols(size)
+    layout = _layout(size)
+    candidates = [(1 << size) - 1] * (size * size)
+    values = [0] * (size * size)
+    givens = [
+        (r * size + c, 1 << symbols.index(v)) for r, row in enumerate(grid) for c, v in enumerate(row) if v != "."
+    ]
+    if not _propagate(candidates, values, givens, layout, stats):
+        return 0, None
+
+    solution: tp.List[tp.Optional[tp.List[tp.List[str]]]] = [None]
+
+    def search(candidates: tp.List[int], values: tp.List[int], limit: int) -> int:
+        best, best_count = -1, size + 1
+        for cell, value in enumerate(values):
+            if not value:
+                count = candidates[cell].bit_count()
+                if count < best_count:
+                    best, best_count = cell, count
+                    if count == 2:
+                        break
+        if best < 0:
+            if solution[0] is None:
+                solution[0] = group([symbols[bit.bit_length() - 1] for bit in values], size)
+            return 1
+        mask = candidates[best]
+        found = 0
+        while mask and found < limit:
+            bit = mask & -mask
+            mask ^= bit
+            branch_candidates, branch_values = candidates[:], values[:]
+            if stats is not None:
+                stats.push()
+            before = found
+            if _propagate(branch_candidates, branch_values, [(best, bit)], layout, stats):
+                found += search(branch_candidates, branch_values, limit - found)
+            if stats is not None:
+                stats.pop(undone=found == before)
+        return found
+
+    return search(candidates, values, limit), solution[0]
+
+
+def solve_bitmask(
+    grid: tp.List[tp.List[str]], stats: tp.Optional[SolverStats] = None
+) -> tp.Optional[tp.List[tp.List[str]]]:
+    """Решение пазла поиском на битовых масках с эвристикой MRV, пригодно для полей 16x16 и 25x25
+    >>> grid = generate_sudoku(150, size=16)
+    >>> check_solution(solve_bitmask(grid))
+    True
+    """
+    return _bitmask_search(grid, stats=stats)[1]
+
+
+def solve_iterative(
+    grid: tp.List[tp.List[str]], stats: tp.Optional[SolverStats] = None
+) -> tp.Optional[tp.List[tp.List[str]]]:
+    """Решение пазла перебором без рекурсии: явный стек глубин с заранее выделенными массивами
+    оставшихся кандидатов и журналом поставленных значений для отката, выбор клетки по MRV
+    >>> grid = read_sudoku('puzzle1.txt')
+    >>> solve_iterative(grid) == solve(read_sudoku('puzzle1.txt'))
+    True
+    """
+    size = len(grid)
+    box = int(size**0.5)
+    symbols = get_symbols(size)
+    full = (1 << size) - 1
+    rows, cols, boxes = [0] * size, [0] * size, [0] * size
+    empties = []
+    for r, row in enumerate(grid):
+        for c, value in enumerate(row):
+            b = r // box * box + c // box
+            if value == ".":
+                empties.append((r, c, b))
+                continue
+            bit = 1 << symbols.index(value)
+            if (rows[r] | cols[c] | boxes[b]) & bit:
+                return None
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+
+    count = len(empties)
+    remaining = [0] * count  # кандидаты, которые ещё не пробовали на каждой глубине
+    placed = [0] * count  # журнал отката: значение, поставленное на каждой глубине
+    depth = 0
+    descend = True
+    while True:
+        if descend:
+            if depth == count:
+                solution = [row[:] for row in grid]
+                for (r, c, _), bit in zip(empties, placed):
+                    solution[r][c] = symbols[bit.bit_length() - 1]
+                return solution
+            best, best_mask, best_count = depth, 0, size + 1
+            for i in range(depth, count):
+                r, c, b = empties[i]
+                mask = full & ~(rows[r] | cols[c] | boxes[b])
+                mask_count = mask.bit_count()
+                if mask_count < best_count:
+                    best, best_mask, best_count = i, mask, mask_count
+                    if mask_count <= 1:
+                        break
+            empties[depth], empties[best] = empties[best], empties[depth]
+            remaining[depth] = best_mask
+
+        r, c, b = empties[depth]
+        bit = placed[depth]
+        if bit:
+            rows[r] ^= bit
+            cols[c] ^= bit
+            boxes[b] ^= bit
+            placed[depth] = 0
+            if stats is not None:
+                stats.pop()
+        mask = remaining[depth]
+        if not mask:
+            if depth == 0:
+                return None
+            depth -= 1
+            descend = False
+            continue
+        bit = mask & -mask
+        remaining[depth] = mask ^ bit
+        rows[r] |= bit
+        cols[c] |= bit
+        boxes[b] |= bit
+        placed[depth] = bit
+        if stats is not None:
+            stats.push()
+        depth += 1
+        descend = True
+
+
+def count_solutions(grid: tp.List[tp.List[str]], limit: int = 2) -> int:
+    """Посчитать число решений пазла, прекращая поиск после limit найденных
+    >>> count_solutions(read_sudoku('puzzle1.txt'))
+    1
+    >>> count_solutions([['.'] * 9 for _ in range(9)])
+    2
+    """
+    return _bitmask_search(grid, limit)[0]
+
+
+def generate_unique_sudoku(difficulty: str = "medium", rng: tp.Optional[random.Random] = None) -> tp.List[tp.List[str]]:
+    """Генерация судоку с единственным решением и числом подсказок из диапазона DIFFICULTY_CLUES[difficulty]
+    >>> grid = generate_unique_sudoku("easy", random.Random(1))
+    >>> 36 <= sum(1 for row in grid for e in row if e != '.') <= 45
+    True
+    >>> count_solutions(grid)
+    1
+    """
+    low, high = DIFFICULTY_CLUES[difficulty]
+    rng = rng or random.Random(random.getrandbits(64))
+    while True:
+        grid = shuffle_grid(_base_solution(9), rng)
+        target = rng.randint(low, high)
+        clues = 81
+        for r, c in rng.sample([(r, c) for r in range(9) for c in range(9)], 81):
+            if clues == target:
+                break
+            value, grid[r][c] = grid[r][c], "."
+            if count_solutions(grid) == 1:
+                clues -= 1
+            else:
+                grid[r][c] = value
+        if clues <= high:
+            return grid
+
+
+def _generate_job(job: tp.Tuple[str, int]) -> tp.List[tp.List[str]]:
+    difficulty, seed = job
+    return generate_unique_sudoku(difficulty, random.Random(seed))
+
+
+def generate_sudoku_batch(
+    count: int, difficulty: str = "medium", seed: tp.Optional[int] = None, processes: tp.Optional[int] = None
+) -> tp.List[tp.List[tp.List[str]]]:
+    """Сгенерировать count судоку с единственным решением, распределив работу по процессам"""
+    rng = random.Random(seed)
+    jobs = [(difficulty, rng.getrandbits(64)) for _ in range(count)]
+    processes = processes or multiprocessing.cpu_count()
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(_generate_job, jobs, chunksize=max(1, count // (4 * processes)))
+
+
+class SudokuTransform(tp.NamedTuple):
+    """Преобразование судоку 9x9: транспонирование, затем перестановка строк и столбцов
+    (canonical[i][j] = grid[rows[i]][cols[j]]) и переименование символов labels"""
+
+    transpose: bool
+    rows: tp.Tuple[int, ...]
+    cols: tp.Tuple[int, ...]
+    labels: tp.Dict[str, str]
+
+
+@functools.lru_cache(maxsize=None)
+def _band_permutations() -> tp.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Все 1296 перестановок строк 9x9, сохраняющих полосы; таблица перестановки 9-битных масок строк
+    каждой из них; номера перестановок, начинающихся с каждой строки"""
+    perms = np.array(
+        [
+            [bands[b] * 3 + lines[b][i] for b in range(3) for i in range(3)]
+            for bands in itertools.permutations(range(3))
+            for lines in itertools.product(itertools.permutations(range(3)), repeat=3)
+        ],
+        dtype=np.intp,
+    )
+    shifts = 8 - np.arange(9)
+    bits = (np.arange(512)[:, None] >> shifts) & 1
+    table = (bits[:, perms] << shifts).sum(axis=2).T
+    by_first = np.array([np.flatnonzero(perms[:, 0] == i) for i in range(9)])
+    return perms, table, by_first
+
+
+def canonical_form(grid: tp.List[tp.List[str]]) -> tp.Tuple[str, SudokuTransform]:
+    """Каноническая форма судоку 9x9 среди всех вариантов, получаемых перестановками полос, стеков,
+    строк внутри полос, столбцов внутри стеков, транспонированием и переименованием цифр.
+    Сначала минимизируется расположение подсказок (пустые клетки раньше), затем сами цифры,
+    переименованные в порядке первого появления. Возвращает форму и преобразование grid в неё
+    >>> grid = read_sudoku('puzzle1.txt')
+    >>> canonical_form(grid)[0] == canonical_form(shuffle_grid(grid))[0]
+    True
+    """
+    if len(grid) != 9:
+        raise ValueError("Canonical form is defined for 9x9 sudoku only")
+    perms, table, by_first = _band_permutations()
+    values = np.array([[0 if v == "." else SYMBOLS.index(v) + 1 for v in row] for row in grid], dtype=np.intp)
+    grids = np.stack((values, values.T))
+    masks = ((grids > 0) << (8 - np.arange(9))).sum(axis=2)
+
+    # Расположение подсказок: выбрать первую строку и перестановку столбцов с наименьшей маской,
+    # затем отсеивать перестановки строк, начинающиеся с неё, строка за строкой
+    first = table[:, masks]
+    cols, flags, starts = np.nonzero(first == first.min())
+    rows = by_first[starts].ravel()
+    cols = np.repeat(cols, by_first.shape[1])
+    flags = np.repeat(flags, by_first.shape[1])
+    for j in range(1, 9):
+        row_masks = table[cols, masks[flags, perms[rows, j]]]
+        keep = row_masks == row_masks.min()
+        rows, cols, flags = rows[keep], cols[keep], flags[keep]
+
+    # Цифры: у оставшихся вариантов подсказки стоят на одних и тех же местах, переименовываем цифры
+    # в порядке появления и отсеиваем варианты клетка за клеткой
+    labels = np.zeros((len(rows), 10), dtype=np.intp)
+    next_label = np.ones(len(rows), dtype=np.intp)
+    clues = [
+        (r, c) for r in range(9) for c in range(9) if masks[flags[0], perms[rows[0], r]] >> (8 - perms[cols[0], c]) & 1
+    ]
+    for r, c in clues:
+        if len(rows) == 1:
+            break
+        index = np.arange(len(rows))
+        digits = grids[flags, perms[rows, r], perms[cols, c]]
+        new = labels[index, digits] == 0
+        labels[index[new], digits[new]] = next_label[new]
+        next_label[new] += 1
+        cell_labels = labels[index, digits]
+        keep = cell_labels == cell_labels.min()
+        rows, cols, flags, labels, next_label = rows[keep], cols[keep], flags[keep], labels[keep], next_label[keep]
+
+    transform = SudokuTransform(
+        bool(flags[0]), tuple(perms[rows[0]].tolist()), tuple(perms[cols[0]].tolist()), {".": "."}
+    )
+    for r, c in clues:
+        digit = grids[flags[0], transform.rows[r], transform.cols[c]]
+        transform.labels.setdefault(SYMBOLS[digit - 1], SYMBOLS[len(transform.labels) - 1])
+    for symbol in get_symbols(9):
+        transform.labels.setdefault(symbol, SYMBOLS[len(transform.labels) - 1])
+    return "".join(c for row in apply_transform(grid, transform) for c in row), transform
+
+
+def apply_transform(grid: tp.List[tp.List[str]], transform: SudokuTransform) -> tp.List[tp.List[str]]:
+    """Применить преобразование к судоку"""
+    source = [list(col) for col in zip(*grid)] if transform.transpose else grid
+    return [[transform.labels[source[r][c]] for c in transform.cols] for r in transform.rows]
+
+
+def invert_transform(grid: tp.List[tp.List[str]], transform: SudokuTransform) -> tp.List[tp.List[str]]:
+    """Применить к судоку преобразование, обратное transform"""
+    labels = {label: symbol for symbol, label in transform.labels.items()}
+    result = [["."] * 9 for _ in range(9)]
+    for i, r in enumerate(transform.rows):
+        for j, c in enumerate(transform.cols):
+            result[r][c] = labels[grid[i][j]]
+    return [list(col) for col in zip(*result)] if transform.transpose else result
+
+
+class SolutionCache:
+    """LRU-кэш решений, ключ — каноническая форма пазла. Если указан path, решения также
+    сохраняются на диск и переживают перезапуск"""
+
+    def __init__(self, maxsize: int = 4096, path: tp.Optional[tp.Union[str, pathlib.Path]] = None) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._memory: tp.OrderedDict[str, str] = collections.OrderedDict()
+        self._disk = shelve.open(str(path)) if path is not None else None
+
+    def get(self, key: str) -> tp.Optional[str]:
+        solution = self._memory.get(key)
+        if solution is None and self._disk is not None:
+            solution = self._disk.get(key)
+            if solution is not None:
+                self._remember(key, solution)
+        if solution is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._memory.move_to_end(key)
+        return solution
+
+    def put(self, key: str, solution: str) -> None:
+        self._remember(key, solution)
+        if self._disk is not None:
+            self._disk[key] = solution
+
+    def _remember(self, key: str, solution: str) -> None:
+        self._memory[key] = solution
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def __enter__(self) -> "SolutionCache":
+        return self
+
+    def __exit__(self, *args: tp.Any) -> None:
+        self.close()
+
+
+Engine = tp.Callable[[tp.List[tp.List[str]], tp.Optional[SolverStats]], tp.Optional[tp.List[tp.List[str]]]]
+ENGINES: tp.Dict[str, Engine] = {
+    "backtracking": solve_backtracking,
+    "bitmask": solve_bitmask,
+    "iterative": solve_iterative,
+}
+
+
+def read_puzzles(path: tp.Union[str, pathlib.Path]) -> tp.List[tp.List[tp.List[str]]]:
+    """Прочитать пазлы из файла: либо один пазл, записанный сеткой, либо по пазлу в строке"""
+    path = pathlib.Path(path)
+    with path.open() as f:
+        lines = [line for line in f.read().splitlines() if line.strip()]
+    if all(sum(c in SYMBOLS + "." for c in line) in (81, 256, 625) for line in lines):
+        return [create_grid(line) for line in lines]
+    return [create_grid("\n".join(lines))]
+
+
+def write_stats(records: tp.List[tp.Dict[str, tp.Any]], path: tp.Union[str, pathlib.Path]) -> None:
+    """Сохранить статистику решений в JSON или, если у файла расширение .csv, в CSV"""
+    path = pathlib.Path(path)
+    with path.open("w", newline="") as f:
+        if path.suffix == ".csv":
+            writer = csv.DictWriter(f, fieldnames=list(records[0]) if records else [])
+            writer.writeheader()
+            writer.writerows(records)
         else:
-            display(solution)
+            json.dump(records, f, indent=2)
+
+
+def main(argv: tp.Optional[tp.List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Решение судоку из файлов")
+    parser.add_argument("files", nargs="*", default=["puzzle1.txt", "puzzle2.txt", "puzzle3.txt"])
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="backtracking")
+    parser.add_argument("--stats", help="файл для статистики решений (.json или .csv)")
+    parser.add_argument("--quiet", action="store_true", help="не выводить пазлы и решения")
+    args = parser.parse_args(argv)
+
+    records = []
+    for fname in args.files:
+        for index, grid in enumerate(read_puzzles(fname)):
+            if not args.quiet:
+                display(grid)
+            stats = SolverStats() if args.stats else None
+            solution = solve(grid, args.engine, stats=stats)
+            if not solution:
+                print(f"Puzzle {fname} can't be solved")
+            elif not args.quiet:
+                display(solution)
+            if stats is not None:
+                records.append(
+                    {"file": fname, "index": index, "engine": args.engine, "solved": bool(solution), **stats.as_dict()}
+                )
+    if args.stats:
+        write_stats(records, args.stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import unittest
+
+import bench_sudoku
+import sudoku
+
+
+class BenchSudokuTestCase(unittest.TestCase):
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(50.0, bench_sudoku.percentile(values, 50))
+        self.assertEqual(99.0, bench_sudoku.percentile(values, 99))
+        self.assertEqual(100.0, bench_sudoku.percentile(values, 100))
+        self.assertEqual(7.0, bench_sudoku.percentile([7.0], 99))
+
+    def test_bench_corpus(self):
+        puzzles = [sudoku.read_sudoku("puzzle1.txt"), sudoku.read_sudoku("puzzle2.txt")]
+        result = bench_sudoku.bench_corpus("bitmask", puzzles)
+        self.assertEqual(2, result["puzzles"])
+        self.assertLessEqual(result["median_ms"], result["p99_ms"])
+        self.assertGreater(result["puzzles_per_s"], 0)
+        self.assertEqual(".", puzzles[0][0][2])
+
+    def test_run(self):
+        corpora = {"puzzle1": [sudoku.read_sudoku("puzzle1.txt")]}
+        results = bench_sudoku.run(["bitmask", "iterative"], corpora, timeout=30)
+        self.assertEqual({"bitmask", "iterative"}, set(results))
+        self.assertEqual(1, results["iterative"]["puzzle1"]["puzzles"])
+        self.assertIn("median_ms", results["iterative"]["puzzle1"])
+
+    def test_regressions(self):
+        baseline = {"bitmask": {"a": {"median_ms": 1.0}, "b": {"median_ms": 1.0}, "c": {"median_ms": 1.0}}}
+        results = {"bitmask": {"a": {"median_ms": 1.2}, "b": {"median_ms": 2.0}, "c": {"timeout": 60}, "d": {}}}
+        found = bench_sudoku.regressions(results, baseline, tolerance=1.5)
+        self.assertEqual(2, len(found))
+        self.assertTrue(found[0].startswith("bitmask/b"))
+        self.assertTrue(found[1].startswith("bitmask/c"))
@@ -1,3 +1,11 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import random
+import sys
+import tempfile
 import unittest
 
 import sudoku
@@ -239,4 +247,238 @@ class SudokuTestCase(unittest.TestCase):
         self.assertEqual(expected_unknown, actual_unknown)
         solution = sudoku.solve(grid)
         solved = sudoku.check_solution(solution)
-        self.assertTrue(solved)
\ No newline at end of file
+        self.assertTrue(solved)
+
+    def test_shuffle_grid(self):
+        solution = sudoku.solve(sudoku.read_sudoku("puzzle1.txt"))
+        for seed in range(10):
+            shuffled = sudoku.shuffle_grid(solution, random.Random(seed))
+            self.assertTrue(sudoku.check_solution(shuffled))
+
+        puzzle = sudoku.read_sudoku("puzzle2.txt")
+        shuffled = sudoku.shuffle_grid(puzzle, random.Random(0))
+        self.assertEqual(
+            sum(1 for row in puzzle for e in row if e == "."),
+            sum(1 for row in shuffled for e in row if e == "."),
+        )
+        self.assertEqual(1, sudoku.count_solutions(shuffled))
+
+    def test_count_solutions(self):
+        self.assertEqual(1, sudoku.count_solutions(sudoku.read_sudoku("puzzle1.txt")))
+        self.assertEqual(2, sudoku.count_solutions([["."] * 9 for _ in range(9)]))
+        self.assertEqual(5, sudoku.count_solutions([["."] * 9 for _ in range(9)], limit=5))
+
+        grid = sudoku.read_sudoku("puzzle1.txt")
+        grid[0][2] = "5"
+        self.assertEqual(0, sudoku.count_solutions(grid))
+
+    def test_generate_unique_sudoku(self):
+        for difficulty, (low, high) in sudoku.DIFFICULTY_CLUES.items():
+            with self.subTest(difficulty=difficulty):
+                grid = sudoku.generate_unique_sudoku(difficulty, random.Random(42))
+                clues = sum(1 for row in grid for e in row if e != ".")
+                self.assertTrue(low <= clues <= high)
+                self.assertEqual(1, sudoku.count_solutions(grid))
+                self.assertTrue(sudoku.check_solution(sudoku.solve(grid)))
+
+    def test_generate_sudoku_batch(self):
+        grids = sudoku.generate_sudoku_batch(4, "easy", seed=1, processes=2)
+        self.assertEqual(4, len(grids))
+        for grid in grids:
+            self.assertEqual(1, sudoku.count_solutions(grid))
+        self.assertEqual(grids, sudoku.generate_sudoku_batch(4, "easy", seed=1, processes=2))
+
+    def test_get_symbols(self):
+        self.assertEqual("1234", sudoku.get_symbols(4))
+        self.assertEqual("123456789", sudoku.get_symbols(9))
+        self.assertEqual("123456789ABCDEFG", sudoku.get_symbols(16))
+        self.assertEqual("123456789ABCDEFGHIJKLMNOP", sudoku.get_symbols(25))
+        with self.assertRaises(ValueError):
+            sudoku.get_symbols(10)
+
+    def test_create_grid_16x16(self):
+        puzzle = "123456789ABCDEFG" + "." * 240
+        grid = sudoku.create_grid(puzzle)
+        self.assertEqual(16, len(grid))
+        self.assertEqual(list("123456789ABCDEFG"), grid[0])
+        self.assertEqual(set("123456789ABCDEFG") - {"1", "2", "3", "4"}, sudoku.find_possible_values(grid, (1, 1)))
+
+    def test_solve_bitmask(self):
+        grid = sudoku.read_sudoku("puzzle1.txt")
+        self.assertEqual(sudoku.solve(sudoku.read_sudoku("puzzle1.txt")), sudoku.solve(grid, engine="bitmask"))
+
+        random.seed(16)
+        for size, filled in [(16, 110), (25, 350)]:
+            with self.subTest(size=size):
+                grid = sudoku.generate_sudoku(filled, size=size)
+                solution = sudoku.solve(grid, engine="bitmask")
+                self.assertTrue(sudoku.check_solution(solution))
+                for row, solved_row in zip(grid, solution):
+                    for value, solved_value in zip(row, solved_row):
+                        if value != ".":
+                            self.assertEqual(value, solved_value)
+
+        with self.assertRaises(ValueError):
+            sudoku.solve(grid, engine="unknown")
+
+    def test_check_solution_16x16(self):
+        solution = sudoku.shuffle_grid(sudoku._base_solution(16), random.Random(0))
+        self.assertTrue(sudoku.check_solution(solution))
+        solution[0][0], solution[0][1] = solution[0][1], solution[0][0]
+        self.assertFalse(sudoku.check_solution(solution))
+
+    def test_check_solution_rejects_empty_block_cells(self):
+        solution = sudoku.solve(sudoku.read_sudoku("puzzle1.txt"))
+        for r, c in [(0, 0), (4, 4), (8, 8)]:
+            with self.subTest(pos=(r, c)):
+                grid = [row[:] for row in solution]
+                grid[r][c] = "."
+                self.assertFalse(sudoku.check_solution(grid))
+
+    def test_check_solutions(self):
+        good_solution = sudoku.solve(sudoku.read_sudoku("puzzle1.txt"))
+        not_solved = [row[:] for row in good_solution]
+        not_solved[8][8] = "."
+        swapped = [row[:] for row in good_solution]
+        swapped[0][0], swapped[0][1] = swapped[0][1], swapped[0][0]
+        same_rows = [[str(v) for v in range(1, 10)]] * 9
+        grids = [good_solution, not_solved, swapped, same_rows, sudoku.shuffle_grid(good_solution)]
+
+        array = sudoku.solutions_to_array(grids)
+        self.assertEqual((5, 9, 9), array.shape)
+        self.assertEqual([sudoku.check_solution(grid) for grid in grids], sudoku.check_solutions(array).tolist())
+        self.assertEqual([True, False, False, False, True], sudoku.check_solutions(array, chunk_size=2).tolist())
+
+        lines = ["".join(c for row in grid for c in row) for grid in grids]
+        self.assertEqual(array.tolist(), sudoku.solutions_to_array(lines).tolist())
+
+        solution = sudoku.shuffle_grid(sudoku._base_solution(16), random.Random(1))
+        self.assertEqual([True], sudoku.check_solutions(sudoku.solutions_to_array([solution], size=16)).tolist())
+
+    def test_canonical_form(self):
+        rng = random.Random(29)
+        for fname in ["puzzle1.txt", "puzzle2.txt", "puzzle3.txt"]:
+            with self.subTest(fname=fname):
+                grid = sudoku.read_sudoku(fname)
+                key, transform = sudoku.canonical_form(grid)
+                self.assertEqual(81, len(key))
+                self.assertEqual(grid, sudoku.invert_transform(sudoku.apply_transform(grid, transform), transform))
+                for _ in range(5):
+                    self.assertEqual(key, sudoku.canonical_form(sudoku.shuffle_grid(grid, rng))[0])
+
+        self.assertNotEqual(
+            sudoku.canonical_form(sudoku.read_sudoku("puzzle1.txt"))[0],
+            sudoku.canonical_form(sudoku.read_sudoku("puzzle2.txt"))[0],
+        )
+
+    def test_solve_with_cache(self):
+        rng = random.Random(30)
+        grid = sudoku.read_sudoku("puzzle1.txt")
+        cache = sudoku.SolutionCache()
+        expected_solution = sudoku.solve([row[:] for row in grid], cache=cache)
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+
+        for _ in range(3):
+            variant = sudoku.shuffle_grid(grid, rng)
+            solution = sudoku.solve([row[:] for row in variant], cache=cache)
+            self.assertTrue(sudoku.check_solution(solution))
+            for row, solved_row in zip(variant, solution):
+                for value, solved_value in zip(row, solved_row):
+                    if value != ".":
+                        self.assertEqual(value, solved_value)
+        self.assertEqual((3, 1), (cache.hits, cache.misses))
+        self.assertEqual(0.75, cache.hit_rate)
+        self.assertEqual(expected_solution, sudoku.solve([row[:] for row in grid], cache=cache))
+
+        cache = sudoku.SolutionCache()
+        empty = [["."] * 9 for _ in range(9)]
+        self.assertTrue(sudoku.check_solution(sudoku.solve(empty, engine="bitmask", cache=cache)))
+        self.assertEqual((0, 0), (cache.hits, cache.misses))
+
+    def test_solution_cache_on_disk(self):
+        grid = sudoku.read_sudoku("puzzle2.txt")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "solutions")
+            with sudoku.SolutionCache(path=path) as cache:
+                sudoku.solve([row[:] for row in grid], engine="bitmask", cache=cache)
+            with sudoku.SolutionCache(maxsize=1, path=path) as cache:
+                solution = sudoku.solve(sudoku.shuffle_grid(grid), engine="bitmask", cache=cache)
+                self.assertEqual((1, 0), (cache.hits, cache.misses))
+                self.assertTrue(sudoku.check_solution(solution))
+
+    def test_solve_with_stats(self):
+        for engine in sudoku.ENGINES:
+            with self.subTest(engine=engine):
+                stats = sudoku.SolverStats()
+                solution = sudoku.solve(sudoku.read_sudoku("puzzle1.txt"), engine=engine, stats=stats)
+                self.assertTrue(sudoku.check_solution(solution))
+                self.assertGreater(stats.wall_time, 0)
+                self.assertGreaterEqual(stats.nodes, stats.backtracks)
+                self.assertGreaterEqual(stats.nodes, stats.max_depth)
+                record = stats.as_dict()
+                self.assertEqual(["nodes", "backtracks", "propagations", "max_depth", "wall_time"], list(record))
+
+        stats = sudoku.SolverStats()
+        sudoku.solve(sudoku.read_sudoku("puzzle1.txt"), stats=stats)
+        self.assertEqual(51, stats.nodes - stats.backtracks)
+        self.assertEqual((0, 51), (stats.propagations, stats.max_depth))
+
+        stats = sudoku.SolverStats()
+        sudoku.solve(sudoku.read_sudoku("puzzle1.txt"), engine="bitmask", stats=stats)
+        self.assertEqual(51, stats.propagations)
+
+        puzzles = sudoku.read_puzzles("hard_puzzles.txt")
+        stats = sudoku.SolverStats()
+        sudoku.solve(puzzles[7], engine="bitmask", stats=stats)
+        self.assertEqual((1, 0), (stats.nodes, stats.backtracks))
+        stats = sudoku.SolverStats()
+        sudoku.solve(puzzles[6], engine="bitmask", stats=stats)
+        self.assertGreater(stats.backtracks, 0)
+        self.assertLessEqual(1, stats.nodes - stats.backtracks)
+        self.assertLessEqual(stats.nodes - stats.backtracks, stats.max_depth)
+
+    def test_read_puzzles(self):
+        self.assertEqual([sudoku.read_sudoku("puzzle1.txt")], sudoku.read_puzzles("puzzle1.txt"))
+        puzzles = sudoku.read_puzzles("hard_puzzles.txt")
+        self.assertEqual(95, len(puzzles))
+        self.assertEqual(9, len(puzzles[0]))
+
+    def test_main_writes_stats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for suffix in ["json", "csv"]:
+                path = os.path.join(tmp, f"stats.{suffix}")
+                with contextlib.redirect_stdout(io.StringIO()):
+                    sudoku.main(["puzzle1.txt", "puzzle2.txt", "--engine", "bitmask", "--quiet", "--stats", path])
+                with open(path) as f:
+                    records = json.load(f) if suffix == "json" else list(csv.DictReader(f))
+                self.assertEqual(["puzzle1.txt", "puzzle2.txt"], [record["file"] for record in records])
+                self.assertEqual("51", str(records[0]["propagations"]))
+
+    def test_solve_iterative(self):
+        for fname in ["puzzle1.txt", "puzzle2.txt", "puzzle3.txt"]:
+            with self.subTest(fname=fname):
+                grid = sudoku.read_sudoku(fname)
+                solution = sudoku.solve(grid, engine="iterative")
+                self.assertTrue(sudoku.check_solution(solution))
+                self.assertEqual(sudoku.solve(grid, engine="bitmask"), solution)
+
+        random.seed(31)
+        grid = sudoku.generate_sudoku(0, size=16)
+        stats = sudoku.SolverStats()
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(100)
+        try:
+            solution = sudoku.solve(grid, engine="iterative", stats=stats)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+        self.assertTrue(sudoku.check_solution(solution))
+        self.assertEqual(256, stats.max_depth)
+
+        grid = sudoku.read_sudoku("puzzle1.txt")
+        grid[0][2] = "5"
+        self.assertIsNone(sudoku.solve(grid, engine="iterative"))
+        grid[0][2] = "."
+        grid[0][3] = "1"
+        grid[0][5] = "2"
+        grid[0][8] = "4"
+        self.assertIsNone(sudoku.solve(grid, engine="iterative"))
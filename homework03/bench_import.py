@@ -0,0 +1,59 @@
+"""Время импорта модуля maze в отдельном процессе по сравнению с тяжёлыми зависимостями.
+
+Пример:
+    python bench_import.py --repeat 20
+"""
+
+import argparse
+import pathlib
+import statistics
+import subprocess
+import sys
+import time
+import typing as tp
+
+STATEMENTS = {
+    "python": "pass",
+    "maze": "import maze",
+    "numpy": "import numpy",
+    "pandas": "import pandas",
+}
+
+
+def time_import(statement: str, repeat: int) -> tp.Dict[str, float]:
+    """Медиана и минимум времени запуска python -c statement из папки с maze.py, в миллисекундах"""
+    here = pathlib.Path(__file__).parent
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], cwd=here, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": statistics.median(times), "min_ms": min(times)}
+
+
+def loaded_modules() -> tp.List[str]:
+    """Тяжёлые модули, которые оказываются загружены после import maze"""
+    here = pathlib.Path(__file__).parent
+    code = "import sys, maze; print(' '.join(m for m in ('numpy', 'pandas') if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=here, check=True, capture_output=True, text=True)
+    return output.stdout.split()
+
+
+def main(argv: tp.Optional[tp.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк времени импорта maze")
+    parser.add_argument("--repeat", type=int, default=10, help="запусков на каждый вариант")
+    args = parser.parse_args(argv)
+
+    for name, statement in STATEMENTS.items():
+        try:
+            result = time_import(statement, args.repeat)
+        except subprocess.CalledProcessError:
+            print(f"{name:>8}: not installed")
+            continue
+        print(f"{name:>8}: median {result['median_ms']:7.1f} ms, min {result['min_ms']:7.1f} ms")
+    print(f"modules loaded by import maze: {', '.join(loaded_modules()) or 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Бенчмарк генерации и решения лабиринтов: время и пик памяти (tracemalloc) по размерам.
+
+Пример:
+    python bench_maze.py --output bench.json
+    python bench_maze.py --operations solve_maze/wavefront solve_maze/bfs --sizes 15 101 501
+"""
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import pathlib
+import random
+import sys
+import time
+import tracemalloc
+import typing as tp
+
+import maze
+
+SIZES = [15, 101, 501, 1001, 2001, 4001]
+
+
+def _list_maze(size: int, seed: int) -> tp.List[tp.List[tp.Union[str, int]]]:
+    random.seed(seed)
+    return maze.bin_tree_maze(size, size, random_exit=False)
+
+
+def _solved(size: int, seed: int) -> tp.Tuple[tp.List[tp.List[tp.Union[str, int]]], tp.Any]:
+    """Пронумерованная волной сетка (как после solve_maze методом wavefront) и путь"""
+    compact = maze.MazeGrid.from_list(_list_maze(size, seed))
+    solved, path = maze.solve_maze(compact)
+    return solved.to_list(), path
+
+
+def _setup(operation: str, size: int, seed: int) -> tp.Callable[[], tp.Any]:
+    """Подготовить данные (не замеряется) и вернуть замеряемый вызов"""
+    if operation == "bin_tree_maze":
+        random.seed(seed)
+        return lambda: maze.bin_tree_maze(size, size)
+    if operation == "bin_tree_maze_numpy":
+        return lambda: maze.bin_tree_maze_numpy(size, size, seed=seed)
+    if operation.startswith("generate_maze/"):
+        algorithm = operation.split("/", 1)[1]
+        return lambda: maze.generate_maze(size, size, algorithm, seed=seed)
+    if operation == "solve_maze/compact":
+        compact = maze.MazeGrid.from_list(_list_maze(size, seed))
+        return lambda: maze.solve_maze(compact)
+    if operation.startswith("solve_maze/"):
+        grid, method = _list_maze(size, seed), operation.split("/", 1)[1]
+        return lambda: maze.solve_maze(grid, method)
+    if operation == "shortest_path":
+        numbered, _ = _solved(size, seed)
+        exit_coord = maze.get_exits(_list_maze(size, seed))[1]
+        return lambda: maze.shortest_path(numbered, exit_coord)
+    if operation == "add_path_to_grid":
+        _, path = _solved(size, seed)
+        grid = _list_maze(size, seed)
+        return lambda: maze.add_path_to_grid(grid, path)
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+OPERATIONS = [
+    "bin_tree_maze",
+    "bin_tree_maze_numpy",
+    *[f"generate_maze/{algorithm}" for algorithm in maze.GENERATORS if algorithm != "binary_tree"],
+    "solve_maze/wavefront",
+    *[f"solve_maze/{method}" for method in maze.SEARCH_METHODS],
+    "solve_maze/compact",
+    "shortest_path",
+    "add_path_to_grid",
+]
+
+
+def bench_case(operation: str, size: int, seed: int, memory: bool = True) -> tp.Dict[str, float]:
+    """Время одного вызова и, если memory, пик памяти при повторном вызове под tracemalloc"""
+    importlib.import_module("numpy")  # maze импортирует numpy лениво, время импорта не должно попасть в замер
+    call = _setup(operation, size, seed)
+    start = time.perf_counter()
+    call()
+    result = {"seconds": time.perf_counter() - start}
+    if memory:
+        call = _setup(operation, size, seed)
+        tracemalloc.start()
+        try:
+            call()
+            result["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run(
+    operations: tp.List[str], sizes: tp.List[int], seed: int, timeout: float, memory: bool = True
+) -> tp.Dict[str, tp.Dict[str, tp.Dict[str, float]]]:
+    """Прогнать каждую операцию на каждом размере в отдельном процессе.
+    Когда размер не уложился в timeout секунд, вместо результата записывается timeout,
+    а большие размеры этой операции пропускаются"""
+    results: tp.Dict[str, tp.Dict[str, tp.Dict[str, float]]] = {}
+    for operation in operations:
+        results[operation] = {}
+        for size in sorted(sizes):
+            with multiprocessing.Pool(1) as pool:
+                job = pool.apply_async(bench_case, (operation, size, seed, memory))
+                try:
+                    results[operation][str(size)] = job.get(timeout)
+                except multiprocessing.TimeoutError:
+                    results[operation][str(size)] = {"timeout": timeout}
+                    break
+    return results
+
+
+def main(argv: tp.Optional[tp.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк генерации и решения лабиринтов")
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=OPERATIONS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES, help="стороны квадратных лабиринтов")
+    parser.add_argument("--seed", type=int, default=102)
+    parser.add_argument("--timeout", type=float, default=60.0, help="секунд на одну операцию и размер")
+    parser.add_argument("--no-memory", action="store_true", help="не замерять пик памяти")
+    parser.add_argument("--output", help="файл для результатов в JSON (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run(args.operations, args.sizes, args.seed, args.timeout, not args.no_memory)
+    report = json.dumps(results, indent=2)
+    if args.output:
+        pathlib.Path(args.output).write_text(report)
+    else:
+        print(report)
+    print(f"Done in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,137 @@
+import mmap
+import os
+import struct
+import time
+from array import array
+from collections import deque
 from copy import deepcopy
-from random import choice, randint
-from typing import List, Optional, Tuple, Union
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from random import Random, choice, randint
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
-import pandas as pd
+if TYPE_CHECKING:
+    import numpy as np
+
+# numpy импортируется внутри функций, которым он нужен: генерация, решение и отрисовка
+# лабиринта в виде списков обходятся без него, и импорт модуля остаётся быстрым
+
+WALL, EMPTY, EXIT = 0, 1, 2
+CELL_SYMBOLS = ("■", " ", "X")
+
+MAZE_MAGIC = b"MAZE"
+MAZE_VERSION = 1
+# магия, версия, число строк, число столбцов, число выходов; дальше выходы (y, x) и битовая карта
+_HEADER = struct.Struct("<4sBIII")
+_EXIT = struct.Struct("<II")
 
 
 def create_grid(rows: int = 15, cols: int = 15) -> List[List[Union[str, int]]]:
     return [["■"] * cols for _ in range(rows)]
 
 
-def remove_wall(grid: List[List[Union[str, int]]], coord: Tuple[int, int]) -> List[List[Union[str, int]]]:
+@dataclass
+class MazeGrid:
+    """
+    Компактная сетка лабиринта: по байту на клетку (WALL, EMPTY или EXIT) в порядке строк
+    и отдельный массив int32 расстояний, который заполняет solve_maze.
     """
-    Убирает стену между выбранной клеткой и соседней (вверх или вправо) для алгоритма Binary Tree.
 
-    :param grid: текущая сетка
-    :param coord: координаты клетки (y, x)
-    :return: обновлённая сетка
+    rows: int
+    cols: int
+    cells: bytearray = field(repr=False)
+    distance: Optional[array] = field(default=None, repr=False)
+
+    @classmethod
+    def filled(cls, rows: int, cols: int) -> "MazeGrid":
+        """
+        Создаёт сетку, целиком состоящую из стен.
+
+        :param rows: число строк
+        :param cols: число столбцов
+        :return: компактная сетка
+        """
+        return cls(rows, cols, bytearray(rows * cols))
+
+    @classmethod
+    def from_list(cls, grid: List[List[Union[str, int]]]) -> "MazeGrid":
+        """
+        Преобразует сетку-список в компактную. Числа после solve_maze считаются пустыми клетками.
+
+        :param grid: сетка лабиринта
+        :return: компактная сетка
+        """
+        kinds: Dict[Union[str, int], int] = {symbol: kind for kind, symbol in enumerate(CELL_SYMBOLS)}
+        cells = bytearray(kinds.get(s, EMPTY) for row in grid for s in row)
+        return cls(len(grid), len(grid[0]), cells)
+
+    def to_list(self) -> List[List[Union[str, int]]]:
+        """
+        Преобразует компактную сетку в сетку-список. Если массив расстояний заполнен,
+        вместо проходимых клеток записываются расстояния, как после solve_maze для списка.
+
+        :return: сетка лабиринта
+        """
+        grid: List[List[Union[str, int]]] = []
+        for start in range(0, self.rows * self.cols, self.cols):
+            row = self.cells[start : start + self.cols]
+            if self.distance is None:
+                grid.append([CELL_SYMBOLS[kind] for kind in row])
+            else:
+                distance = self.distance[start : start + self.cols]
+                grid.append(["■" if kind == WALL else k for kind, k in zip(row, distance)])
+        return grid
+
+
+def _cell(grid: Union[List[List[Union[str, int]]], MazeGrid], y: int, x: int) -> Union[str, int]:
     """
+    Возвращает клетку сетки любого вида в форме списка.
 
-    y, x = coord
+    :param grid: сетка лабиринта
+    :param y: номер строки
+    :param x: номер столбца
+    :return: символ или число клетки
+    """
+    if isinstance(grid, MazeGrid):
+        return CELL_SYMBOLS[grid.cells[y * grid.cols + x]]
+    return grid[y][x]
+
+
+def _shape(grid: Union[List[List[Union[str, int]]], MazeGrid]) -> Tuple[int, int]:
+    """
+    Возвращает размеры сетки любого вида.
+
+    :param grid: сетка лабиринта
+    :return: число строк и столбцов
+    """
+    if isinstance(grid, MazeGrid):
+        return grid.rows, grid.cols
+    return len(grid), len(grid[0])
+
+
+def _wall_to_remove(y: int, x: int, cols: int) -> Tuple[int, int]:
+    """
+    Выбирает стену, которую сносит remove_wall для клетки (y, x).
+
+    :param y: номер строки клетки
+    :param x: номер столбца клетки
+    :param cols: число столбцов
+    :return: координаты стены (или самой клетки, если снести нечего)
+    """
     y_remove, x_remove = y, x
-    cols = len(grid[0])
 
     decision = choice(("up", "right"))
     if decision == "up" and 0 <= y - 2:
@@ -33,6 +144,19 @@ def remove_wall(grid: List[List[Union[str, int]]], coord: Tuple[int, int]) -> Li
     elif 0 <= y - 2 and x < cols - 1:
         y_remove, x_remove = y - 1, x
 
+    return y_remove, x_remove
+
+
+def remove_wall(grid: List[List[Union[str, int]]], coord: Tuple[int, int]) -> List[List[Union[str, int]]]:
+    """
+    Убирает стену между выбранной клеткой и соседней (вверх или вправо) для алгоритма Binary Tree.
+
+    :param grid: текущая сетка
+    :param coord: координаты клетки (y, x)
+    :return: обновлённая сетка
+    """
+
+    y_remove, x_remove = _wall_to_remove(coord[0], coord[1], len(grid[0]))
     grid[y_remove][x_remove] = " "
 
     return grid
@@ -48,16 +172,29 @@ def bin_tree_maze(rows: int = 15, cols: int = 15, random_exit: bool = True) -> L
     :return: сетка лабиринта с входом и выходом, отмеченными "X"
     """
 
-    grid = create_grid(rows, cols)
-    empty_cells = []
-    for x, row in enumerate(grid):
-        for y, _ in enumerate(row):
-            if x % 2 == 1 and y % 2 == 1:
-                grid[x][y] = " "
-                empty_cells.append((x, y))
+    return bin_tree_maze_compact(rows, cols, random_exit).to_list()
+
+
+def bin_tree_maze_compact(rows: int = 15, cols: int = 15, random_exit: bool = True) -> MazeGrid:
+    """
+    Генерирует лабиринт по алгоритму Binary Tree сразу в компактной сетке.
+    При одинаковом состоянии random результат совпадает с bin_tree_maze.
+
+    :param rows: число строк
+    :param cols: число столбцов
+    :param random_exit: True — случайные вход и выход, False — фиксированные
+    :return: компактная сетка лабиринта с входом и выходом EXIT
+    """
+
+    maze = MazeGrid.filled(rows, cols)
+    cells = maze.cells
+    for y in range(1, rows, 2):
+        cells[y * cols + 1 : (y + 1) * cols : 2] = bytes([EMPTY]) * len(range(1, cols, 2))
 
-    for cell in empty_cells:
-        grid = remove_wall(grid, cell)
+    for y in range(1, rows, 2):
+        for x in range(1, cols, 2):
+            y_remove, x_remove = _wall_to_remove(y, x, cols)
+            cells[y_remove * cols + x_remove] = EMPTY
 
     # 1. выбрать любую клетку
     # 2. выбрать направление: наверх или направо.
@@ -75,12 +212,372 @@ def bin_tree_maze(rows: int = 15, cols: int = 15, random_exit: bool = True) -> L
         x_in, y_in = 0, cols - 2
         x_out, y_out = rows - 1, 1
 
-    grid[x_in][y_in], grid[x_out][y_out] = "X", "X"
+    cells[x_in * cols + y_in], cells[x_out * cols + y_out] = EXIT, EXIT
 
-    return grid
+    return maze
+
+
+def bin_tree_maze_numpy(
+    rows: int = 15, cols: int = 15, random_exit: bool = True, seed: Optional[int] = None
+) -> MazeGrid:
+    """
+    Генерирует лабиринт по алгоритму Binary Tree без цикла по клеткам: все решения "вверх/вправо"
+    берутся одним вызовом генератора NumPy, стены сносятся индексацией массива.
+    Правила у границ те же, что в remove_wall, но случайная последовательность другая,
+    поэтому с bin_tree_maze лабиринты совпадают только по свойствам.
+
+    :param rows: число строк
+    :param cols: число столбцов
+    :param random_exit: True — случайные вход и выход, False — фиксированные
+    :param seed: зерно генератора NumPy (None — случайное)
+    :return: компактная сетка лабиринта с входом и выходом EXIT
+    """
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    rng = np.random.default_rng(seed)
+    cells = np.full((rows, cols), WALL, dtype=np.uint8)
+    ys = np.arange(1, rows, 2)[:, None]
+    xs = np.arange(1, cols, 2)[None, :]
+    cells[1::2, 1::2] = EMPTY
+
+    can_up = ys >= 2
+    can_right = xs + 2 < cols - 1
+    chose_up = rng.integers(0, 2, size=(ys.size, xs.size), dtype=np.uint8).astype(bool) & can_up
+    right = ~chose_up & can_right
+    up = chose_up | (~right & can_up & (xs < cols - 1))
+
+    up_y, up_x = np.nonzero(up)
+    cells[2 * up_y, 2 * up_x + 1] = EMPTY
+    right_y, right_x = np.nonzero(right)
+    cells[2 * right_y + 1, 2 * right_x + 2] = EMPTY
+
+    if random_exit:
+        x_in, x_out = (int(v) for v in rng.integers(0, rows, size=2))
+        y_in = int(rng.integers(0, cols)) if x_in in (0, rows - 1) else int(rng.choice((0, cols - 1)))
+        y_out = int(rng.integers(0, cols)) if x_out in (0, rows - 1) else int(rng.choice((0, cols - 1)))
+    else:
+        x_in, y_in = 0, cols - 2
+        x_out, y_out = rows - 1, 1
+
+    cells[x_in, y_in], cells[x_out, y_out] = EXIT, EXIT
+
+    return MazeGrid(rows, cols, bytearray(cells.tobytes()))
+
+
+def _open_cells(rows: int, cols: int) -> Tuple[MazeGrid, int, int]:
+    """
+    Создаёт сетку из стен с открытыми клетками на нечётных координатах, не задевая границу.
+
+    :param rows: число строк
+    :param cols: число столбцов
+    :return: сетка, число клеток по вертикали и по горизонтали
+    """
+    maze = MazeGrid.filled(rows, cols)
+    height, width = (rows - 1) // 2, (cols - 1) // 2
+    for i in range(height):
+        start = (2 * i + 1) * cols + 1
+        maze.cells[start : start + 2 * width : 2] = bytes([EMPTY]) * width
+    return maze, height, width
+
+
+def _carve(maze: MazeGrid, width: int, cell: int, other: int) -> None:
+    """
+    Сносит стену между соседними клетками с номерами cell и other (i * width + j).
+
+    :param maze: компактная сетка
+    :param width: число клеток по горизонтали
+    :param cell: номер первой клетки
+    :param other: номер второй клетки
+    """
+    (i, j), (other_i, other_j) = divmod(cell, width), divmod(other, width)
+    maze.cells[(i + other_i + 1) * maze.cols + j + other_j + 1] = EMPTY
+
+
+def _cell_neighbours(cell: int, height: int, width: int) -> List[int]:
+    """
+    Возвращает номера клеток, соседних с данной.
+
+    :param cell: номер клетки (i * width + j)
+    :param height: число клеток по вертикали
+    :param width: число клеток по горизонтали
+    :return: список номеров соседей
+    """
+    i, j = divmod(cell, width)
+    neighbours = []
+    if i > 0:
+        neighbours.append(cell - width)
+    if i < height - 1:
+        neighbours.append(cell + width)
+    if j > 0:
+        neighbours.append(cell - 1)
+    if j < width - 1:
+        neighbours.append(cell + 1)
+    return neighbours
+
+
+def _place_exits(maze: MazeGrid, random_exit: bool, rng: Random) -> MazeGrid:
+    """
+    Отмечает вход и выход так же, как bin_tree_maze.
+
+    :param maze: компактная сетка
+    :param random_exit: True — случайные вход и выход, False — фиксированные
+    :param rng: генератор случайных чисел
+    :return: та же сетка с входом и выходом EXIT
+    """
+    rows, cols = maze.rows, maze.cols
+    if random_exit:
+        x_in, x_out = rng.randint(0, rows - 1), rng.randint(0, rows - 1)
+        y_in = rng.randint(0, cols - 1) if x_in in (0, rows - 1) else rng.choice((0, cols - 1))
+        y_out = rng.randint(0, cols - 1) if x_out in (0, rows - 1) else rng.choice((0, cols - 1))
+    else:
+        x_in, y_in = 0, cols - 2
+        x_out, y_out = rows - 1, 1
+
+    maze.cells[x_in * cols + y_in], maze.cells[x_out * cols + y_out] = EXIT, EXIT
+    return maze
+
+
+def backtracker_maze(rows: int = 15, cols: int = 15, random_exit: bool = True, seed: Optional[int] = None) -> MazeGrid:
+    """
+    Генерирует лабиринт рекурсивным возвратом (поиск в глубину) с явным стеком вместо рекурсии.
+    Даёт длинные извилистые коридоры без перекоса к краям, как у Binary Tree.
+
+    :param rows: число строк
+    :param cols: число столбцов
+    :param random_exit: True — случайные вход и выход, False — фиксированные
+    :param seed: зерно генератора (None — случайное)
+    :return: компактная сетка лабиринта с входом и выходом EXIT
+    """
+    rng = Random(seed)
+    maze, height, width = _open_cells(rows, cols)
+    if height and width:
+        visited = bytearray(height * width)
+        start = rng.randrange(height * width)
+        visited[start] = 1
+        stack = [start]
+        while stack:
+            cell = stack[-1]
+            unvisited = [other for other in _cell_neighbours(cell, height, width) if not visited[other]]
+            if not unvisited:
+                stack.pop()
+                continue
+            other = rng.choice(unvisited)
+            visited[other] = 1
+            _carve(maze, width, cell, other)
+            stack.append(other)
+    return _place_exits(maze, random_exit, rng)
+
+
+def kruskal_maze(rows: int = 15, cols: int = 15, random_exit: bool = True, seed: Optional[int] = None) -> MazeGrid:
+    """
+    Генерирует лабиринт алгоритмом Краскала: стены перебираются в случайном порядке,
+    стена сносится, если клетки по её сторонам ещё в разных множествах (система непересекающихся
+    множеств с объединением по размеру и сжатием путей).
+
+    :param rows: число строк
+    :param cols: число столбцов
+    :param random_exit: True — случайные вход и выход, False — фиксированные
+    :param seed: зерно генератора (None — случайное)
+    :return: компактная сетка лабиринта с входом и выходом EXIT
+    """
+    rng = Random(seed)
+    maze, height, width = _open_cells(rows, cols)
+    cells = height * width
+    edges = [(cell, cell + 1) for cell in range(cells) if cell % width < width - 1]
+    edges += [(cell, cell + width) for cell in range(cells - width)]
+    rng.shuffle(edges)
+
+    parent = array("i", range(cells))
+    size = array("i", [1]) * cells
+
+    def find(cell: int) -> int:
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    joined = 0
+    for cell, other in edges:
+        root, other_root = find(cell), find(other)
+        if root == other_root:
+            continue
+        if size[root] < size[other_root]:
+            root, other_root = other_root, root
+        parent[other_root] = root
+        size[root] += size[other_root]
+        _carve(maze, width, cell, other)
+        joined += 1
+        if joined == cells - 1:
+            break
+    return _place_exits(maze, random_exit, rng)
+
+
+def wilson_maze(rows: int = 15, cols: int = 15, random_exit: bool = True, seed: Optional[int] = None) -> MazeGrid:
+    """
+    Генерирует лабиринт алгоритмом Уилсона: случайные блуждания со стиранием петель
+    до уже построенного дерева. Каждый лабиринт получается с равной вероятностью.
+
+    :param rows: число строк
+    :param cols: число столбцов
+    :param random_exit: True — случайные вход и выход, False — фиксированные
+    :param seed: зерно генератора (None — случайное)
+    :return: компактная сетка лабиринта с входом и выходом EXIT
+    """
+    rng = Random(seed)
+    maze, height, width = _open_cells(rows, cols)
+    if height and width:
+        in_tree = bytearray(height * width)
+        in_tree[rng.randrange(height * width)] = 1
+        step = array("i", [-1]) * (height * width)
+        for start in range(height * width):
+            # блуждание запоминает только последний выход из каждой клетки, так петли стираются сами
+            cell = start
+            while not in_tree[cell]:
+                step[cell] = rng.choice(_cell_neighbours(cell, height, width))
+                cell = step[cell]
+            cell = start
+            while not in_tree[cell]:
+                in_tree[cell] = 1
+                _carve(maze, width, cell, step[cell])
+                cell = step[cell]
+    return _place_exits(maze, random_exit, rng)
+
+
+def eller_rows(cols: int, rows: Optional[int] = None, seed: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Генерирует лабиринт алгоритмом Эллера по одной строке сетки (байты WALL/EMPTY, как MazeGrid.cells).
+    Хранится только состояние текущего ряда клеток — O(cols) памяти при любой высоте.
+
+    :param cols: число столбцов
+    :param rows: число строк (None — бесконечный лабиринт, строки выдаются, пока их берут)
+    :param seed: зерно генератора (None — случайное)
+    :return: итератор строк сетки сверху вниз
+    """
+    rng = Random(seed)
+    width = (cols - 1) // 2
+    height = None if rows is None else (rows - 1) // 2
+    wall_row = bytes(cols)
+    yield wall_row
+
+    # номера множеств клеток текущего ряда всегда лежат в range(width)
+    sets = list(range(width))
+    parent = list(range(width))
+
+    def find(label: int) -> int:
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    i = 0
+    while height is None or i < height:
+        last = height is not None and i == height - 1
+        row = bytearray(cols)
+        row[1 : 2 * width : 2] = bytes([EMPTY]) * width
+        parent[:] = range(width)
+        for j in range(width - 1):
+            left, right = find(sets[j]), find(sets[j + 1])
+            if left != right and (last or rng.random() < 0.5):
+                parent[right] = left
+                row[2 * j + 2] = EMPTY
+        yield bytes(row)
+
+        below = bytearray(cols)
+        if not last:
+            groups: Dict[int, List[int]] = {}
+            for j in range(width):
+                groups.setdefault(find(sets[j]), []).append(j)
+            down = [False] * width
+            for columns in groups.values():
+                down[rng.choice(columns)] = True
+                for j in columns:
+                    down[j] = down[j] or rng.random() < 0.5
+            labels: Dict[int, int] = {}
+            for j in range(width):
+                if down[j]:
+                    below[2 * j + 1] = EMPTY
+                    sets[j] = labels.setdefault(find(sets[j]), len(labels))
+            fresh = len(labels)
+            for j in range(width):
+                if not down[j]:
+                    sets[j] = fresh
+                    fresh += 1
+        yield bytes(below)
+        i += 1
+
+    if rows is not None:
+        for _ in range(rows - 1 - 2 * i):
+            yield wall_row
+
+
+def eller_maze(rows: int = 15, cols: int = 15, random_exit: bool = True, seed: Optional[int] = None) -> MazeGrid:
+    """
+    Генерирует лабиринт алгоритмом Эллера целиком в компактной сетке.
+
+    :param rows: число строк
+    :param cols: число столбцов
+    :param random_exit: True — случайные вход и выход, False — фиксированные
+    :param seed: зерно генератора (None — случайное)
+    :return: компактная сетка лабиринта с входом и выходом EXIT
+    """
+    rng = Random(seed)
+    cells = bytearray().join(eller_rows(cols, rows, rng.getrandbits(64)))
+    return _place_exits(MazeGrid(rows, cols, cells), random_exit, rng)
 
 
-def get_exits(grid: List[List[Union[str, int]]]) -> List[Tuple[int, int]]:
+def write_rows(rows: Iterable[bytes], path: str) -> int:
+    """
+    Построчно записывает строки сетки в текстовый файл символами "■", " " и "X",
+    не собирая лабиринт в памяти.
+
+    :param rows: строки сетки, например из eller_rows
+    :param path: путь к файлу
+    :return: число записанных строк
+    """
+    table = dict(enumerate(CELL_SYMBOLS))
+    count = 0
+    with open(path, "w", encoding="utf-8") as file:
+        for row in rows:
+            file.write(row.decode("latin-1").translate(table) + "\n")
+            count += 1
+    return count
+
+
+MazeGenerator = Callable[[int, int, bool, Optional[int]], MazeGrid]
+GENERATORS: Dict[str, MazeGenerator] = {
+    "binary_tree": bin_tree_maze_numpy,
+    "backtracker": backtracker_maze,
+    "kruskal": kruskal_maze,
+    "wilson": wilson_maze,
+    "eller": eller_maze,
+}
+
+
+def generate_maze(
+    rows: int = 15,
+    cols: int = 15,
+    algorithm: str = "binary_tree",
+    random_exit: bool = True,
+    seed: Optional[int] = None,
+) -> MazeGrid:
+    """
+    Генерирует лабиринт выбранным алгоритмом. Все алгоритмы строят совершенный лабиринт
+    (между любыми двумя клетками ровно один путь) в компактной сетке.
+
+    :param rows: число строк
+    :param cols: число столбцов
+    :param algorithm: имя алгоритма из GENERATORS
+    :param random_exit: True — случайные вход и выход, False — фиксированные
+    :param seed: зерно генератора (None — случайное)
+    :return: компактная сетка лабиринта с входом и выходом EXIT
+    """
+    if algorithm not in GENERATORS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    return GENERATORS[algorithm](rows, cols, random_exit, seed)
+
+
+def get_exits(grid: Union[List[List[Union[str, int]]], MazeGrid]) -> List[Tuple[int, int]]:
     """ "
     Находит все клетки входа/выхода ("X") в лабиринте.
 
@@ -88,6 +585,14 @@ def get_exits(grid: List[List[Union[str, int]]]) -> List[Tuple[int, int]]:
     :return: список координат выходов [(y, x), ...]
     """
 
+    if isinstance(grid, MazeGrid):
+        exits = []
+        position = grid.cells.find(EXIT)
+        while position >= 0:
+            exits.append(divmod(position, grid.cols))
+            position = grid.cells.find(EXIT, position + 1)
+        return exits
+
     return [(y, x) for y, row in enumerate(grid) for x, s in enumerate(row) if s == "X"]
 
 
@@ -142,7 +647,561 @@ def shortest_path(
     return path
 
 
-def encircled_exit(grid: List[List[Union[str, int]]], coord: Tuple[int, int]) -> bool:
+def _restore_path(parent: Sequence[int], source: int, target: int, cols: int) -> List[Tuple[int, int]]:
+    """
+    Восстанавливает путь по массиву родителей.
+
+    :param parent: массив родителей, parent[source] == source
+    :param source: номер начальной клетки (y * cols + x)
+    :param target: номер конечной клетки
+    :param cols: число столбцов
+    :return: список координат пути от target до source
+    """
+    path = [divmod(target, cols)]
+    cell = target
+    while cell != source:
+        cell = parent[cell]
+        path.append(divmod(cell, cols))
+    return path
+
+
+def bfs_path(
+    grid: List[List[Union[str, int]]], start: Tuple[int, int], goal: Tuple[int, int]
+) -> Tuple[Optional[List[Tuple[int, int]]], int]:
+    """
+    Ищет кратчайший путь поиском в ширину с очередью: каждая клетка посещается один раз,
+    для восстановления пути хранится массив родителей.
+
+    :param grid: сетка лабиринта
+    :param start: координаты начала пути (y, x)
+    :param goal: координаты конца пути (y, x)
+    :return: список координат пути от goal до start (None если путь невозможен) и число раскрытых клеток
+    """
+    rows = len(grid)
+    cols = len(grid[0])
+    source = start[0] * cols + start[1]
+    target = goal[0] * cols + goal[1]
+    parent = [-1] * (rows * cols)
+    parent[source] = source
+    queue = deque([source])
+    expanded = 0
+    while queue:
+        cell = queue.popleft()
+        expanded += 1
+        if cell == target:
+            return _restore_path(parent, source, target, cols), expanded
+        y, x = divmod(cell, cols)
+        for next_y, next_x in [(y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)]:
+            if 0 <= next_y < rows and 0 <= next_x < cols and grid[next_y][next_x] != "■":
+                next_cell = next_y * cols + next_x
+                if parent[next_cell] < 0:
+                    parent[next_cell] = cell
+                    queue.append(next_cell)
+    return None, expanded
+
+
+def bfs_frontier(
+    grid: List[List[Union[str, int]]], start: Tuple[int, int], goal: Tuple[int, int], batch: int = 256
+) -> Generator[List[Tuple[int, int]], None, Optional[List[Tuple[int, int]]]]:
+    """
+    Поиск в ширину по частям: генератор отдаёт раскрытые клетки пачками не больше batch,
+    чтобы между пачками вызывающий код (например, цикл событий GUI) мог заняться своими делами.
+
+    :param grid: сетка лабиринта
+    :param start: координаты начала пути (y, x)
+    :param goal: координаты конца пути (y, x)
+    :param batch: наибольшее число клеток в одной пачке
+    :return: путь от goal до start (None если путь невозможен) как значение StopIteration
+    """
+    rows = len(grid)
+    cols = len(grid[0])
+    source = start[0] * cols + start[1]
+    target = goal[0] * cols + goal[1]
+    parent = [-1] * (rows * cols)
+    parent[source] = source
+    queue = deque([source])
+    expanded: List[Tuple[int, int]] = []
+    while queue:
+        cell = queue.popleft()
+        y, x = divmod(cell, cols)
+        expanded.append((y, x))
+        if cell == target:
+            yield expanded
+            return _restore_path(parent, source, target, cols)
+        if len(expanded) >= batch:
+            yield expanded
+            expanded = []
+        for next_y, next_x in [(y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)]:
+            if 0 <= next_y < rows and 0 <= next_x < cols and grid[next_y][next_x] != "■":
+                next_cell = next_y * cols + next_x
+                if parent[next_cell] < 0:
+                    parent[next_cell] = cell
+                    queue.append(next_cell)
+    if expanded:
+        yield expanded
+    return None
+
+
+def astar_path(
+    grid: List[List[Union[str, int]]], start: Tuple[int, int], goal: Tuple[int, int]
+) -> Tuple[Optional[List[Tuple[int, int]]], int]:
+    """
+    Ищет кратчайший путь алгоритмом A* с манхэттенским расстоянием до цели в качестве эвристики.
+    При равной оценке раньше раскрываются клетки, дальше ушедшие от начала.
+
+    :param grid: сетка лабиринта
+    :param start: координаты начала пути (y, x)
+    :param goal: координаты конца пути (y, x)
+    :return: список координат пути от goal до start (None если путь невозможен) и число раскрытых клеток
+    """
+    rows = len(grid)
+    cols = len(grid[0])
+    goal_y, goal_x = goal
+    source = start[0] * cols + start[1]
+    target = goal_y * cols + goal_x
+    parent = [-1] * (rows * cols)
+    distance = [-1] * (rows * cols)
+    parent[source] = source
+    distance[source] = 0
+    heap = [(abs(start[0] - goal_y) + abs(start[1] - goal_x), 0, source)]
+    expanded = 0
+    while heap:
+        _, negative_distance, cell = heappop(heap)
+        if -negative_distance > distance[cell]:
+            continue
+        expanded += 1
+        if cell == target:
+            return _restore_path(parent, source, target, cols), expanded
+        y, x = divmod(cell, cols)
+        next_distance = distance[cell] + 1
+        for next_y, next_x in [(y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)]:
+            if 0 <= next_y < rows and 0 <= next_x < cols and grid[next_y][next_x] != "■":
+                next_cell = next_y * cols + next_x
+                if distance[next_cell] < 0 or next_distance < distance[next_cell]:
+                    distance[next_cell] = next_distance
+                    parent[next_cell] = cell
+                    estimate = next_distance + abs(next_y - goal_y) + abs(next_x - goal_x)
+                    heappush(heap, (estimate, -next_distance, next_cell))
+    return None, expanded
+
+
+def bidirectional_path(
+    grid: List[List[Union[str, int]]], start: Tuple[int, int], goal: Tuple[int, int]
+) -> Tuple[Optional[List[Tuple[int, int]]], int]:
+    """
+    Ищет кратчайший путь двунаправленным поиском в ширину: волны идут от начала и от цели,
+    каждый раз раскрывается целый уровень меньшей из них, пока волны не встретятся.
+
+    :param grid: сетка лабиринта
+    :param start: координаты начала пути (y, x)
+    :param goal: координаты конца пути (y, x)
+    :return: список координат пути от goal до start (None если путь невозможен) и число раскрытых клеток
+    """
+    rows = len(grid)
+    cols = len(grid[0])
+    source = start[0] * cols + start[1]
+    target = goal[0] * cols + goal[1]
+    if source == target:
+        return [goal], 0
+    parents = ([-1] * (rows * cols), [-1] * (rows * cols))
+    distances = ([-1] * (rows * cols), [-1] * (rows * cols))
+    frontiers = ([source], [target])
+    for side, cell in enumerate((source, target)):
+        parents[side][cell] = cell
+        distances[side][cell] = 0
+    expanded = 0
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        parent, distance, other_distance = parents[side], distances[side], distances[1 - side]
+        next_frontier = []
+        meeting, meeting_length = -1, -1
+        for cell in frontiers[side]:
+            expanded += 1
+            y, x = divmod(cell, cols)
+            next_distance = distance[cell] + 1
+            for next_y, next_x in [(y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)]:
+                if 0 <= next_y < rows and 0 <= next_x < cols and grid[next_y][next_x] != "■":
+                    next_cell = next_y * cols + next_x
+                    if distance[next_cell] < 0:
+                        distance[next_cell] = next_distance
+                        parent[next_cell] = cell
+                        next_frontier.append(next_cell)
+                        length = next_distance + other_distance[next_cell]
+                        if other_distance[next_cell] >= 0 and (meeting < 0 or length < meeting_length):
+                            meeting, meeting_length = next_cell, length
+        if meeting >= 0:
+            to_goal = _restore_path(parents[1], target, meeting, cols)
+            to_start = _restore_path(parents[0], source, meeting, cols)
+            return to_goal[::-1] + to_start[1:], expanded
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+    return None, expanded
+
+
+SearchMethod = Callable[
+    [List[List[Union[str, int]]], Tuple[int, int], Tuple[int, int]], Tuple[Optional[List[Tuple[int, int]]], int]
+]
+SEARCH_METHODS: Dict[str, SearchMethod] = {
+    "bfs": bfs_path,
+    "astar": astar_path,
+    "bidirectional": bidirectional_path,
+}
+
+
+def find_path(
+    grid: List[List[Union[str, int]]], start: Tuple[int, int], goal: Tuple[int, int], method: str = "bfs"
+) -> Tuple[Optional[List[Tuple[int, int]]], int]:
+    """
+    Ищет кратчайший путь между двумя клетками выбранным методом.
+
+    :param grid: сетка лабиринта
+    :param start: координаты начала пути (y, x)
+    :param goal: координаты конца пути (y, x)
+    :param method: "bfs", "astar" или "bidirectional"
+    :return: список координат пути от goal до start (None если путь невозможен) и число раскрытых клеток
+    """
+    if method not in SEARCH_METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    return SEARCH_METHODS[method](grid, start, goal)
+
+
+def dijkstra_path(
+    grid: Union[List[List[Union[str, int]]], MazeGrid],
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    weights: Union[Sequence[Sequence[int]], Sequence[int], "np.ndarray"],
+) -> Tuple[Optional[List[Tuple[int, int]]], Optional[int]]:
+    """
+    Ищет самый дешёвый путь алгоритмом Дейкстры, когда вход в каждую клетку стоит weights.
+    Элемент кучи — одно целое число расстояние * число_клеток + номер клетки вместо кортежа,
+    поэтому стоимости должны быть целыми (дробные можно заранее умножить на общий знаменатель).
+
+    :param grid: сетка лабиринта
+    :param start: координаты начала пути (y, x)
+    :param goal: координаты конца пути (y, x)
+    :param weights: неотрицательная целая стоимость входа в клетку: матрица размера сетки (список списков
+        или массив NumPy) или плоский массив по строкам
+    :return: список координат пути от goal до start и его стоимость, либо (None, None) если путь невозможен
+    :raises ValueError: если стоимостей не столько, сколько клеток, или они не целые неотрицательные
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    rows, cols = _shape(grid)
+    size = rows * cols
+    cells = grid.cells if isinstance(grid, MazeGrid) else MazeGrid.from_list(grid).cells
+    matrix = np.asarray(weights)
+    if matrix.size != size:
+        raise ValueError(f"Expected {size} weights, got {matrix.size}")
+    if size and matrix.dtype.kind not in "iu":
+        raise ValueError(f"Weights must be integers, got {matrix.dtype}")
+    if size and matrix.min() < 0:
+        raise ValueError("Weights must be non-negative")
+    cost = array("q", matrix.ravel().tolist())
+
+    source = start[0] * cols + start[1]
+    target = goal[0] * cols + goal[1]
+    parent = array("i", [-1]) * size
+    distance = array("q", [-1]) * size
+    parent[source] = source
+    distance[source] = 0
+    heap = [source]
+    while heap:
+        current, cell = divmod(heappop(heap), size)
+        if current > distance[cell]:
+            continue
+        if cell == target:
+            return _restore_path(parent, source, target, cols), current
+        y, x = divmod(cell, cols)
+        for next_y, next_x in [(y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)]:
+            if 0 <= next_y < rows and 0 <= next_x < cols:
+                next_cell = next_y * cols + next_x
+                if cells[next_cell] == WALL:
+                    continue
+                next_distance = current + cost[next_cell]
+                if distance[next_cell] < 0 or next_distance < distance[next_cell]:
+                    distance[next_cell] = next_distance
+                    parent[next_cell] = cell
+                    heappush(heap, next_distance * size + next_cell)
+    return None, None
+
+
+class MazeSolver:
+    """
+    Решатель для многих запросов к одному неизменному лабиринту. Буферы родителей, очереди
+    и отметок посещения выделяются один раз; сброс между запросами — увеличение номера запроса.
+    """
+
+    def __init__(self, grid: Union[List[List[Union[str, int]]], MazeGrid]) -> None:
+        """
+        :param grid: сетка лабиринта; сетка-список один раз переводится в компактную форму
+        """
+        compact = grid if isinstance(grid, MazeGrid) else MazeGrid.from_list(grid)
+        self.rows, self.cols = compact.rows, compact.cols
+        self.cells = compact.cells
+        size = self.rows * self.cols
+        self.parent = array("i", bytes(4 * size))
+        self.queue = array("i", bytes(4 * size))
+        self.seen = array("I", bytes(4 * size))
+        self.query = 0
+
+    def _next_query(self) -> int:
+        """
+        Начинает новый запрос: клетки с отметкой, отличной от номера запроса, считаются непосещёнными.
+
+        :return: номер запроса
+        """
+        self.query += 1
+        if self.query > 0xFFFFFFFF:
+            self.seen = array("I", bytes(len(self.seen) * 4))
+            self.query = 1
+        return self.query
+
+    def shortest_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """
+        Ищет кратчайший путь поиском в ширину по предвыделенным буферам.
+
+        :param start: координаты начала пути (y, x)
+        :param goal: координаты конца пути (y, x)
+        :return: список координат пути от goal до start, либо None если путь невозможен
+        """
+        rows, cols, cells = self.rows, self.cols, self.cells
+        parent, queue, seen = self.parent, self.queue, self.seen
+        query = self._next_query()
+        source = start[0] * cols + start[1]
+        target = goal[0] * cols + goal[1]
+        parent[source] = source
+        seen[source] = query
+        queue[0] = source
+        head, tail = 0, 1
+        while head < tail:
+            cell = queue[head]
+            head += 1
+            if cell == target:
+                return _restore_path(parent, source, target, cols)
+            y, x = divmod(cell, cols)
+            for next_y, next_x in [(y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)]:
+                if 0 <= next_y < rows and 0 <= next_x < cols:
+                    next_cell = next_y * cols + next_x
+                    if cells[next_cell] != WALL and seen[next_cell] != query:
+                        seen[next_cell] = query
+                        parent[next_cell] = cell
+                        queue[tail] = next_cell
+                        tail += 1
+        return None
+
+
+class MazeTreeIndex:
+    """
+    Индекс для совершенного лабиринта (проходимые клетки образуют дерево или лес).
+    Строится за O(n log n) один раз: эйлеров обход, глубины клеток и разреженная таблица минимумов.
+    Длина пути между любыми клетками находится за O(1) через наименьшего общего предка,
+    сам путь — за O(длины пути).
+    Случайные выходы bin_tree_maze могут замыкать цикл (два выхода рядом или выход между
+    открытыми клетками границы), поэтому выходы — листья дерева: каждый подвешен к одному соседу,
+    а шаги к остальным проходимым соседям хранятся отдельно как короткие переходы.
+    """
+
+    def __init__(self, grid: Union[List[List[Union[str, int]]], MazeGrid]) -> None:
+        """
+        :param grid: сетка лабиринта без циклов (не считая циклов через выходы)
+        :raises ValueError: если в лабиринте есть цикл, не проходящий через выход
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        compact = grid if isinstance(grid, MazeGrid) else MazeGrid.from_list(grid)
+        rows, cols, cells = compact.rows, compact.cols, compact.cells
+        self.cols = cols
+        size = rows * cols
+        self.parent = array("i", [-1]) * size
+        self.depth = array("i", bytes(4 * size))
+        self.component = array("i", [-1]) * size
+        self.first = array("i", [-1]) * size
+        self.shortcuts: List[Tuple[int, int]] = []
+        euler = array("i")
+
+        # Сначала деревья растут от обычных клеток; выход становится корнем, только если
+        # рядом с ним нет обычных проходимых клеток
+        roots = [root for root in range(size) if cells[root] == EMPTY] + [
+            root for root in range(size) if cells[root] == EXIT
+        ]
+        for root in roots:
+            if self.first[root] >= 0:
+                continue
+            self.parent[root] = root
+            self.component[root] = root
+            self.first[root] = len(euler)
+            euler.append(root)
+            stack, directions = [root], [0]
+            while stack:
+                cell = stack[-1]
+                direction = directions[-1]
+                if direction == 4 or cells[cell] == EXIT:
+                    stack.pop()
+                    directions.pop()
+                    if stack:
+                        euler.append(stack[-1])
+                    continue
+                directions[-1] += 1
+                y, x = divmod(cell, cols)
+                next_y, next_x = [(y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)][direction]
+                if not (0 <= next_y < rows and 0 <= next_x < cols):
+                    continue
+                next_cell = next_y * cols + next_x
+                if cells[next_cell] == WALL or next_cell == self.parent[cell]:
+                    continue
+                if self.first[next_cell] >= 0:
+                    if cells[next_cell] == EXIT:
+                        continue
+                    raise ValueError("Maze has a cycle, MazeTreeIndex needs a perfect maze")
+                self.parent[next_cell] = cell
+                self.depth[next_cell] = self.depth[cell] + 1
+                self.component[next_cell] = root
+                self.first[next_cell] = len(euler)
+                euler.append(next_cell)
+                stack.append(next_cell)
+                directions.append(0)
+
+        for cell in roots[len(roots) - cells.count(EXIT) :]:
+            y, x = divmod(cell, cols)
+            for next_y, next_x in [(y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)]:
+                if not (0 <= next_y < rows and 0 <= next_x < cols):
+                    continue
+                next_cell = next_y * cols + next_x
+                if cells[next_cell] == WALL or next_cell == self.parent[cell]:
+                    continue
+                if cells[next_cell] != EXIT or cell < next_cell:
+                    self.shortcuts.append((cell, next_cell))
+
+        self.euler = np.frombuffer(euler, dtype=np.int32) if euler else np.empty(0, dtype=np.int32)
+        self.euler_depth = np.frombuffer(self.depth, dtype=np.int32)[self.euler]
+        self.table = [np.arange(len(self.euler), dtype=np.int32)]
+        half = 1
+        while 2 * half <= len(self.euler):
+            previous = self.table[-1]
+            left, right = previous[:-half], previous[half:]
+            self.table.append(np.where(self.euler_depth[left] <= self.euler_depth[right], left, right))
+            half *= 2
+
+    def lca(self, first: Tuple[int, int], second: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        Находит наименьшего общего предка двух клеток в дереве обхода.
+
+        :param first: координаты первой клетки (y, x)
+        :param second: координаты второй клетки (y, x)
+        :return: координаты общего предка, либо None если клетки в разных частях лабиринта
+        """
+        cell = self._ancestor(first[0] * self.cols + first[1], second[0] * self.cols + second[1])
+        return None if cell < 0 else divmod(cell, self.cols)
+
+    def _ancestor(self, cell: int, other: int) -> int:
+        """
+        Находит общего предка по номерам клеток.
+
+        :param cell: номер первой клетки (y * cols + x)
+        :param other: номер второй клетки
+        :return: номер общего предка, либо -1 если клетки в разных частях лабиринта
+        """
+        if self.component[cell] < 0 or self.component[cell] != self.component[other]:
+            return -1
+        left, right = sorted((self.first[cell], self.first[other]))
+        level = (right - left + 1).bit_length() - 1
+        a, b = self.table[level][left], self.table[level][right - (1 << level) + 1]
+        return int(self.euler[a if self.euler_depth[a] <= self.euler_depth[b] else b])
+
+    def _tree_distance(self, cell: int, other: int) -> Optional[int]:
+        """
+        Находит длину пути между клетками по дереву, без коротких переходов.
+
+        :param cell: номер первой клетки
+        :param other: номер второй клетки
+        :return: число шагов, либо None если клетки в разных частях лабиринта
+        """
+        ancestor = self._ancestor(cell, other)
+        if ancestor < 0:
+            return None
+        return self.depth[cell] + self.depth[other] - 2 * self.depth[ancestor]
+
+    def _route(self, cell: int, other: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Выбирает кратчайший маршрут по дереву и коротким переходам: Дейкстра на маленьком графе
+        из концов маршрута и концов переходов, где рёбра — пути по дереву и сами переходы.
+
+        :param cell: номер начальной клетки
+        :param other: номер конечной клетки
+        :return: участки маршрута по дереву парами (откуда, куда), между участками — переходы,
+            либо None если путь невозможен
+        """
+        if not self.shortcuts:
+            return None if self._tree_distance(cell, other) is None else [(cell, other)]
+        jumps: Dict[int, List[int]] = {}
+        for first, second in self.shortcuts:
+            jumps.setdefault(first, []).append(second)
+            jumps.setdefault(second, []).append(first)
+        nodes = list(dict.fromkeys([cell, other, *jumps]))
+        distance = {cell: 0}
+        previous: Dict[int, Tuple[int, bool]] = {}
+        heap = [(0, cell)]
+        while heap:
+            current, node = heappop(heap)
+            if current > distance[node]:
+                continue
+            if node == other:
+                break
+            steps = [(next_node, self._tree_distance(node, next_node), False) for next_node in nodes]
+            steps += [(next_node, 1, True) for next_node in jumps.get(node, [])]
+            for next_node, step, jump in steps:
+                if step is None or next_node == node:
+                    continue
+                if next_node not in distance or current + step < distance[next_node]:
+                    distance[next_node] = current + step
+                    previous[next_node] = (node, jump)
+                    heappush(heap, (current + step, next_node))
+        if other not in distance:
+            return None
+
+        route = [(other, other)]
+        node = other
+        while node != cell:
+            node, jump = previous[node]
+            if jump:
+                route.append((node, node))
+            else:
+                route[-1] = (node, route[-1][1])
+        return route[::-1]
+
+    def distance(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[int]:
+        """
+        Находит число шагов кратчайшего пути между клетками.
+
+        :param start: координаты начала пути (y, x)
+        :param goal: координаты конца пути (y, x)
+        :return: число шагов, либо None если путь невозможен
+        """
+        route = self._route(start[0] * self.cols + start[1], goal[0] * self.cols + goal[1])
+        if route is None:
+            return None
+        return len(route) - 1 + sum(cast(int, self._tree_distance(cell, other)) for cell, other in route)
+
+    def path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """
+        Восстанавливает путь между клетками подъёмом к общему предку.
+
+        :param start: координаты начала пути (y, x)
+        :param goal: координаты конца пути (y, x)
+        :return: список координат пути от goal до start, либо None если путь невозможен
+        """
+        route = self._route(start[0] * self.cols + start[1], goal[0] * self.cols + goal[1])
+        if route is None:
+            return None
+        result: List[Tuple[int, int]] = []
+        for cell, other in reversed(route):
+            ancestor = self._ancestor(cell, other)
+            to_goal = _restore_path(self.parent, ancestor, other, self.cols)
+            to_start = _restore_path(self.parent, ancestor, cell, self.cols)
+            result += to_goal + to_start[-2::-1]
+        return result
+
+
+def encircled_exit(grid: Union[List[List[Union[str, int]]], MazeGrid], coord: Tuple[int, int]) -> bool:
     """
     Проверяет, окружён ли указанный выход стенами или находится в углу.
 
@@ -151,32 +1210,88 @@ def encircled_exit(grid: List[List[Union[str, int]]], coord: Tuple[int, int]) ->
     :return: True если выход окружён стенами, иначе False
     """
 
-    rows = len(grid)
-    cols = len(grid[0])
+    rows, cols = _shape(grid)
     y, x = coord
 
     if (x, y) in [(0, 0), (0, cols - 1), (rows - 1, 0), (rows - 1, cols - 1)]:
         return True
 
     if (
-        (y == 0 and grid[y + 1][x] != " ")
-        or (x == cols - 1 and grid[y][x - 1] != " ")
-        or (y == rows - 1 and grid[y - 1][x] != " ")
-        or (x == 0 and grid[y][x + 1] != " ")
+        (y == 0 and _cell(grid, y + 1, x) != " ")
+        or (x == cols - 1 and _cell(grid, y, x - 1) != " ")
+        or (y == rows - 1 and _cell(grid, y - 1, x) != " ")
+        or (x == 0 and _cell(grid, y, x + 1) != " ")
     ):
         return True
 
     return False
 
 
+def _solve_compact(
+    grid: MazeGrid, start: Tuple[int, int], goal: Tuple[int, int]
+) -> Tuple["array[int]", Optional[List[Tuple[int, int]]]]:
+    """
+    Нумерует клетки компактной сетки волной от входа, как make_step, но очередью:
+    вход получает 1, а клетки дальше выхода остаются 0. Сама сетка не меняется.
+
+    :param grid: компактная сетка лабиринта
+    :param start: координаты входа (y, x)
+    :param goal: координаты выхода (y, x)
+    :return: номера клеток и список координат пути от выхода до входа, либо None если путь невозможен
+    """
+    rows, cols, cells = grid.rows, grid.cols, grid.cells
+    distance = array("i", bytes(4 * rows * cols))
+    source = start[0] * cols + start[1]
+    target = goal[0] * cols + goal[1]
+    distance[source] = 1
+    queue = deque([source])
+    while queue:
+        cell = queue.popleft()
+        k = distance[cell]
+        if distance[target] and k >= distance[target]:
+            break
+        y, x = divmod(cell, cols)
+        for next_y, next_x in [(y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)]:
+            if 0 <= next_y < rows and 0 <= next_x < cols:
+                next_cell = next_y * cols + next_x
+                if cells[next_cell] != WALL and distance[next_cell] == 0:
+                    distance[next_cell] = k + 1
+                    queue.append(next_cell)
+
+    if distance[target] == 0:
+        return distance, None
+    y, x = goal
+    k = distance[target]
+    path = [(y, x)]
+    while k != 1:
+        for check_y, check_x in [(y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)]:
+            if 0 <= check_y < rows and 0 <= check_x < cols and distance[check_y * cols + check_x] == k - 1:
+                path.append((check_y, check_x))
+                k -= 1
+                y, x = check_y, check_x
+                break
+    return distance, path
+
+
 def solve_maze(
-    grid: List[List[Union[str, int]]],
-) -> Tuple[List[List[Union[str, int]]], Optional[Union[Tuple[int, int], List[Tuple[int, int]]]]]:
+    grid: Union[List[List[Union[str, int]]], MazeGrid],
+    method: str = "bfs",
+    weights: Optional[Union[Sequence[Sequence[int]], Sequence[int], "np.ndarray"]] = None,
+    stats: Optional[Dict[str, int]] = None,
+) -> Tuple[Union[List[List[Union[str, int]]], MazeGrid], Optional[Union[Tuple[int, int], List[Tuple[int, int]]]]]:
     """
     Находит путь через лабиринт от входа до выхода.
+    Переданная сетка не меняется: для MazeGrid возвращается новая сетка, клетки которой
+    пронумерованы волной в distance, для "wavefront" — пронумерованная копия сетки-списка.
 
     :param grid: сетка лабиринта с входом и выходом
-    :return: обновлённая сетка и список координат пути, либо None если путь невозможен
+    :param method: "wavefront" — нумерация клеток волной через make_step, иначе метод из SEARCH_METHODS;
+        для MazeGrid поддерживаются "bfs" и "wavefront"; не учитывается, если заданы weights
+    :param weights: стоимость входа в каждую клетку; если задана, путь ищется dijkstra_path
+    :param stats: словарь, в который поиск методом из SEARCH_METHODS записывает число раскрытых клеток
+        под ключом "expanded" (как второе значение find_path); в остальных случаях не меняется
+    :return: пронумерованная копия (для "wavefront" и MazeGrid) или исходная сетка и список координат пути,
+        либо None если путь невозможен
     """
 
     exits = get_exits(grid)
@@ -188,6 +1303,22 @@ def solve_maze(
         if encircled_exit(grid, exit_pos):
             return grid, None
 
+    if weights is not None:
+        return grid, dijkstra_path(grid, exits[0], exits[1], weights)[0]
+
+    if isinstance(grid, MazeGrid):
+        if method not in ("bfs", "wavefront"):
+            raise ValueError(f"Unknown method for MazeGrid: {method}")
+        distance, compact_path = _solve_compact(grid, exits[0], exits[1])
+        return MazeGrid(grid.rows, grid.cols, bytearray(grid.cells), distance), compact_path
+
+    if method != "wavefront":
+        found, expanded = find_path(grid, exits[0], exits[1], method)
+        if stats is not None:
+            stats["expanded"] = expanded
+        return grid, found
+
+    grid = deepcopy(grid)
     (y_in, x_in), (y_out, x_out) = exits
 
     grid[y_in][x_in] = 1
@@ -207,29 +1338,287 @@ def solve_maze(
     return grid, path
 
 
+def path_to_array(path: Optional[Union[Tuple[int, int], List[Tuple[int, int]], "np.ndarray"]]) -> "np.ndarray":
+    """
+    Приводит путь из solve_maze к массиву координат формы (N, 2).
+
+    :param path: список координат, одна клетка (y, x), массив или None
+    :return: массив int32 строк (y, x); пустой, если пути нет
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    if path is None or len(path) == 0:
+        return np.empty((0, 2), dtype=np.int32)
+    return np.asarray(path, dtype=np.int32).reshape(-1, 2)
+
+
+def _path_points(
+    path: Optional[Union[Tuple[int, int], List[Tuple[int, int]], "np.ndarray"]]
+) -> Iterable[Tuple[int, int]]:
+    """
+    Приводит путь из solve_maze к последовательности клеток без импорта numpy.
+
+    :param path: список координат, одна клетка (y, x), массив формы (N, 2) или None
+    :return: последовательность координат (y, x)
+    """
+    if path is None:
+        return []
+    if isinstance(path, tuple):
+        return [path]
+    return path
+
+
 def add_path_to_grid(
-    grid: List[List[Union[str, int]]], path: Optional[Union[Tuple[int, int], List[Tuple[int, int]]]]
+    grid: List[List[Union[str, int]]], path: Optional[Union[Tuple[int, int], List[Tuple[int, int]], "np.ndarray"]]
 ) -> List[List[Union[str, int]]]:
     """
-    Отмечает путь в лабиринте, заменяя клетки на "X".
+    Отмечает путь в лабиринте, заменяя клетки на "X". Обходит только клетки пути.
 
     :param grid: сетка лабиринта
-    :param path: список координат пути
+    :param path: список координат пути, одна клетка (y, x) или массив формы (N, 2)
     :return: сетка с отмеченным путем
     """
 
-    if path:
-        for i, row in enumerate(grid):
-            for j, _ in enumerate(row):
-                if (i, j) in path:
-                    grid[i][j] = "X"
+    for y, x in _path_points(path):
+        grid[y][x] = "X"
     return grid
 
 
+def add_path_to_compact(
+    grid: MazeGrid, path: Optional[Union[Tuple[int, int], List[Tuple[int, int]], "np.ndarray"]]
+) -> MazeGrid:
+    """
+    Отмечает путь в компактной сетке, записывая EXIT в клетки пути.
+
+    :param grid: компактная сетка лабиринта
+    :param path: список координат пути, одна клетка (y, x) или массив формы (N, 2)
+    :return: та же сетка с отмеченным путем
+    """
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    points = path_to_array(path)
+    np.frombuffer(grid.cells, dtype=np.uint8)[points[:, 0] * grid.cols + points[:, 1]] = EXIT
+    return grid
+
+
+def render_maze(
+    grid: Union[List[List[Union[str, int]]], MazeGrid],
+    path: Optional[Union[Tuple[int, int], List[Tuple[int, int]], "np.ndarray"]] = None,
+) -> str:
+    """
+    Рисует лабиринт текстом: по символу на клетку, числа после solve_maze показываются пустыми клетками.
+
+    :param grid: сетка лабиринта
+    :param path: путь, клетки которого отмечаются "X"
+    :return: строки лабиринта, разделённые переводом строки
+    """
+    if isinstance(grid, MazeGrid):
+        table = dict(enumerate(CELL_SYMBOLS))
+        cells = grid.cells.decode("latin-1").translate(table)
+        lines = [list(cells[start : start + grid.cols]) for start in range(0, len(cells), grid.cols)]
+    else:
+        lines = [[s if isinstance(s, str) else " " for s in row] for row in grid]
+    for y, x in _path_points(path):
+        lines[y][x] = "X"
+    return "\n".join("".join(line) for line in lines)
+
+
+def save_maze(grid: Union[List[List[Union[str, int]]], MazeGrid], path: str) -> int:
+    """
+    Сохраняет лабиринт в двоичный файл: заголовок с размерами и выходами,
+    затем по биту на клетку (1 — проходима) в порядке строк.
+
+    :param grid: сетка лабиринта
+    :param path: путь к файлу
+    :return: размер файла в байтах
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    compact = grid if isinstance(grid, MazeGrid) else MazeGrid.from_list(grid)
+    exits = get_exits(compact)
+    bits = np.packbits(np.frombuffer(compact.cells, dtype=np.uint8) != WALL)
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAZE_MAGIC, MAZE_VERSION, compact.rows, compact.cols, len(exits)))
+        for y, x in exits:
+            file.write(_EXIT.pack(y, x))
+        file.write(bits.tobytes())
+    return _HEADER.size + _EXIT.size * len(exits) + bits.size
+
+
+class PackedMaze:
+    """
+    Лабиринт из файла save_maze, отображённый в память: открывается без чтения файла,
+    а несколько процессов, открывших один файл, делят его страницы в кэше ОС.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: путь к файлу
+        :raises ValueError: если файл не создан save_maze
+        """
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a maze file")
+        magic, version, self.rows, self.cols, count = _HEADER.unpack_from(self._mmap)
+        self._offset = _HEADER.size + _EXIT.size * count
+        if magic != MAZE_MAGIC or version != MAZE_VERSION or len(self._mmap) < self._offset + self._packed_size:
+            self.close()
+            raise ValueError(f"{path} is not a maze file")
+        self.exits = [_EXIT.unpack_from(self._mmap, _HEADER.size + _EXIT.size * i) for i in range(count)]
+
+    @property
+    def _packed_size(self) -> int:
+        return (self.rows * self.cols + 7) // 8
+
+    def passable(self, y: int, x: int) -> bool:
+        """
+        Проверяет клетку прямо по битовой карте, не распаковывая лабиринт.
+
+        :param y: номер строки
+        :param x: номер столбца
+        :return: True если клетка не стена
+        """
+        cell = y * self.cols + x
+        return bool(self._mmap[self._offset + cell // 8] >> (7 - cell % 8) & 1)
+
+    def to_grid(self) -> MazeGrid:
+        """
+        Распаковывает лабиринт в компактную сетку.
+
+        :return: компактная сетка с выходами EXIT
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        bits = np.frombuffer(self._mmap, dtype=np.uint8, count=self._packed_size, offset=self._offset)
+        cells = bytearray(np.unpackbits(bits, count=self.rows * self.cols).tobytes())
+        del bits
+        for y, x in self.exits:
+            cells[y * self.cols + x] = EXIT
+        return MazeGrid(self.rows, self.cols, cells)
+
+    def close(self) -> None:
+        """Закрывает отображение файла."""
+        self._mmap.close()
+
+    def __enter__(self) -> "PackedMaze":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+def load_maze(path: str) -> MazeGrid:
+    """
+    Загружает лабиринт, сохранённый save_maze.
+
+    :param path: путь к файлу
+    :return: компактная сетка лабиринта
+    """
+    with PackedMaze(path) as packed:
+        return packed.to_grid()
+
+
+@dataclass
+class MazeBatch:
+    """
+    Результат generate_and_solve_batch: сетки, пути в виде массивов (N, 2) (None — пути нет)
+    и время работы всей пачки.
+    """
+
+    grids: List[MazeGrid]
+    paths: List[Optional["np.ndarray"]]
+    seconds: float
+
+    @property
+    def mazes_per_second(self) -> float:
+        return len(self.grids) / self.seconds if self.seconds else float("inf")
+
+
+def _batch_job(job: Tuple[int, str, int, int, int, int, str, bool]) -> Tuple[int, Optional[bytes]]:
+    """
+    Генерирует и решает один лабиринт в процессе-работнике. Клетки записываются прямо
+    в общую память по смещению offset, наружу передаются только байты пути.
+
+    :param job: номер задания, имя общей памяти, смещение, зерно, размеры, алгоритм и случайность выходов
+    :return: номер задания и путь как байты int32 пар (y, x), либо None если пути нет
+    """
+    from multiprocessing import shared_memory  # pylint: disable=import-outside-toplevel
+
+    index, name, offset, seed, rows, cols, algorithm, random_exit = job
+    grid = generate_maze(rows, cols, algorithm, random_exit, seed)
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        memory.buf[offset : offset + rows * cols] = grid.cells
+    finally:
+        memory.close()
+    _, path = solve_maze(grid)
+    if path is None:
+        return index, None
+    points = [path] if isinstance(path, tuple) else path
+    return index, array("i", [coord for point in points for coord in point]).tobytes()
+
+
+def generate_and_solve_batch(
+    jobs: Sequence[Tuple[int, int, int]],
+    algorithm: str = "binary_tree",
+    random_exit: bool = True,
+    processes: Optional[int] = None,
+) -> MazeBatch:
+    """
+    Генерирует и решает пачку лабиринтов в пуле процессов. Работники пишут клетки в один
+    блок общей памяти, поэтому сетки не сериализуются; через pickle проходят только короткие пути.
+
+    :param jobs: задания (зерно, число строк, число столбцов)
+    :param algorithm: имя алгоритма из GENERATORS
+    :param random_exit: True — случайные вход и выход, False — фиксированные
+    :param processes: число процессов (None — по числу ядер)
+    :return: сетки и пути в порядке заданий и время работы
+    """
+    from multiprocessing import (  # pylint: disable=import-outside-toplevel
+        Pool,
+        shared_memory,
+    )
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    if algorithm not in GENERATORS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    offsets = [0]
+    for _, rows, cols in jobs:
+        offsets.append(offsets[-1] + rows * cols)
+    start = time.perf_counter()
+    memory = shared_memory.SharedMemory(create=True, size=max(1, offsets[-1]))
+    try:
+        tasks = [
+            (index, memory.name, offsets[index], seed, rows, cols, algorithm, random_exit)
+            for index, (seed, rows, cols) in enumerate(jobs)
+        ]
+        processes = processes or os.cpu_count() or 1
+        paths: List[Optional[np.ndarray]] = [None] * len(jobs)
+        with Pool(processes) as pool:
+            for index, packed in pool.imap_unordered(
+                _batch_job, tasks, chunksize=max(1, len(tasks) // (4 * processes))
+            ):
+                if packed is not None:
+                    paths[index] = np.frombuffer(packed, dtype=np.int32).reshape(-1, 2)
+        grids = [
+            MazeGrid(rows, cols, bytearray(memory.buf[offsets[index] : offsets[index + 1]]))
+            for index, (_, rows, cols) in enumerate(jobs)
+        ]
+    finally:
+        memory.close()
+        memory.unlink()
+    return MazeBatch(grids, paths, time.perf_counter() - start)
+
+
 if __name__ == "__main__":
-    print(pd.DataFrame(bin_tree_maze(15, 15)))
+    print(render_maze(bin_tree_maze(15, 15)))
+    print()
     GRID = bin_tree_maze(15, 15)
-    print(pd.DataFrame(GRID))
+    print(render_maze(GRID))
+    print()
     _, PATH = solve_maze(GRID)
-    MAZE = add_path_to_grid(GRID, PATH)
-    print(pd.DataFrame(MAZE))
+    print(render_maze(GRID, PATH))
@@ -2,14 +2,28 @@
 
 import tkinter as tk
 from tkinter import messagebox, ttk
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 
-from maze import add_path_to_grid, bin_tree_maze, solve_maze
+from maze import (
+    add_path_to_grid,
+    bfs_frontier,
+    bin_tree_maze,
+    encircled_exit,
+    get_exits,
+    solve_maze,
+)
 
+CELL_COLORS: Dict[Union[str, int], bytes] = {
+    " ": b"\xff\xff\xff",
+    "■": b"\x00\x00\x00",
+    "X": b"\xff\x00\x00",
+}
 
-def draw_cell(
-    x: int, y: int, color: str, size: int = 10, canvas_obj: tk.Canvas = None
-) -> None:
+# Pending after() id of the running animation for each canvas
+_animations: Dict[str, str] = {}
+
+
+def draw_cell(x: int, y: int, color: str, size: int = 10, canvas_obj: Optional[tk.Canvas] = None) -> None:
     """Draw a single cell on the canvas.
 
     :param x: X coordinate
@@ -28,7 +42,9 @@ def draw_cell(
 
 
 def draw_maze(
-    grid: List[List[str]], size: int = 10, canvas_obj: tk.Canvas = None
+    grid: List[List[Union[str, int]]],
+    size: int = 10,
+    canvas_obj: Optional[tk.Canvas] = None,
 ) -> None:
     """Draw the entire maze on the canvas.
 
@@ -51,19 +67,137 @@ def draw_maze(
             draw_cell(x=y, y=x, color=color, size=size, canvas_obj=canvas_obj)
 
 
-def show_solution(grid: List[List[str]], cell_size: int, canvas_obj: tk.Canvas) -> None:
+def maze_to_ppm(grid: List[List[Union[str, int]]], size: int = 10) -> bytes:
+    """Build a binary PPM picture of the maze, one size x size square per cell.
+
+    :param grid: The maze grid
+    :param size: Size of each cell in pixels
+    :return: PPM (P6) image data
+    """
+    white = CELL_COLORS[" "]
+    lines = [b"".join(CELL_COLORS.get(cell, white) * size for cell in row) * size for row in grid]
+    header = f"P6 {len(grid[0]) * size} {len(grid) * size} 255\n".encode()
+    return header + b"".join(lines)
+
+
+def draw_maze_image(grid: List[List[Union[str, int]]], size: int, canvas_obj: tk.Canvas) -> tk.PhotoImage:
+    """Draw the entire maze as a single image item instead of a rectangle per cell.
+
+    :param grid: The maze grid
+    :param size: Size of each cell in pixels
+    :param canvas_obj: Canvas to draw on
+    :return: The image; the caller must keep a reference to it while it is shown
+    """
+    image = tk.PhotoImage(data=maze_to_ppm(grid, size), format="PPM")
+    canvas_obj.delete("all")
+    canvas_obj.create_image(0, 0, anchor="nw", image=image)
+    return image
+
+
+def draw_path(
+    image: tk.PhotoImage,
+    path: Union[Tuple[int, int], List[Tuple[int, int]]],
+    size: int = 10,
+    color: str = "red",
+) -> None:
+    """Paint only the path cells on an image made by draw_maze_image.
+
+    Neighbouring cells of one row are merged, so each run is a single put() call.
+
+    :param image: The maze image
+    :param path: Path cells (y, x) or a single cell
+    :param size: Size of each cell in pixels
+    :param color: Color of the path
+    """
+    cells = sorted(set([path] if isinstance(path, tuple) else path))
+    runs: List[Tuple[int, int, int]] = []
+    for y, x in cells:
+        if runs and runs[-1][0] == y and runs[-1][1] + runs[-1][2] == x:
+            runs[-1] = (y, runs[-1][1], runs[-1][2] + 1)
+        else:
+            runs.append((y, x, 1))
+    pixel = "{" + color + "}"
+    for y, x, length in runs:
+        row = "{" + " ".join([pixel] * (size * length)) + "}"
+        image.put(" ".join([row] * size), to=(x * size, y * size))
+
+
+def cancel_animation(canvas_obj: tk.Canvas) -> None:
+    """Stop the animation running on the canvas, if any.
+
+    :param canvas_obj: Canvas whose after() schedules the frames
+    """
+    pending = _animations.pop(str(canvas_obj), None)
+    if pending is not None:
+        canvas_obj.after_cancel(pending)
+
+
+def show_solution(
+    grid: List[List[Union[str, int]]],
+    cell_size: int,
+    canvas_obj: tk.Canvas,
+    image: Optional[tk.PhotoImage] = None,
+) -> None:
     """Show the solution path on the maze.
 
     :param grid: The maze grid
     :param cell_size: Size of each cell in pixels
     :param canvas_obj: Canvas to draw on
+    :param image: Image from draw_maze_image; if given, only path cells are repainted
     """
+    cancel_animation(canvas_obj)
     _, path = solve_maze(grid)
-    maze = add_path_to_grid(grid, path)
-    if path:
-        draw_maze(maze, cell_size, canvas_obj)
-    else:
+    if not path:
         messagebox.showinfo("Message", "No solutions")
+    elif image is not None:
+        draw_path(image, path, cell_size)
+    else:
+        draw_maze(add_path_to_grid(grid, path), cell_size, canvas_obj)
+
+
+def animate_solution(
+    grid: List[List[Union[str, int]]],
+    cell_size: int,
+    canvas_obj: tk.Canvas,
+    image: tk.PhotoImage,
+    delay: int = 15,
+    batch: int = 64,
+) -> None:
+    """Animate the search on the maze image without blocking the Tk event loop.
+
+    Each after() callback advances the search by one batch of cells and paints
+    that batch, then the final path is painted over the explored cells.
+    A running animation on the same canvas is cancelled and the maze is repainted first.
+
+    :param grid: The maze grid
+    :param cell_size: Size of each cell in pixels
+    :param canvas_obj: Canvas whose after() schedules the frames
+    :param image: Image from draw_maze_image
+    :param delay: Pause between frames in milliseconds
+    :param batch: Cells explored per frame
+    """
+    cancel_animation(canvas_obj)
+    image.configure(data=maze_to_ppm(grid, cell_size), format="PPM")
+    exits = get_exits(grid)
+    if len(set(exits)) != 2 or any(encircled_exit(grid, cell) for cell in exits):
+        show_solution(grid, cell_size, canvas_obj, image)
+        return
+    steps = bfs_frontier(grid, exits[0], exits[1], batch)
+
+    def frame() -> None:
+        _animations.pop(str(canvas_obj), None)
+        try:
+            cells = next(steps)
+        except StopIteration as stop:
+            if stop.value:
+                draw_path(image, stop.value, cell_size)
+            else:
+                messagebox.showinfo("Message", "No solutions")
+            return
+        draw_path(image, cells, cell_size, color="light sky blue")
+        _animations[str(canvas_obj)] = canvas_obj.after(delay, frame)
+
+    frame()
 
 
 if __name__ == "__main__":
@@ -74,16 +208,21 @@ if __name__ == "__main__":
 
     window = tk.Tk()
     window.title("Maze")
-    window.geometry(f"{M * CELL_SIZE + 100}x{N * CELL_SIZE + 100}")
+    window.geometry(f"{M * CELL_SIZE + 100}x{N * CELL_SIZE + 130}")
 
     canvas = tk.Canvas(window, width=M * CELL_SIZE, height=N * CELL_SIZE)
     canvas.pack()
 
-    draw_maze(GRID, CELL_SIZE, canvas)
+    IMAGE = draw_maze_image(GRID, CELL_SIZE, canvas)
     ttk.Button(
         window,
         text="Solve",
-        command=lambda: show_solution(GRID, CELL_SIZE, canvas),
-    ).pack(pady=20)
+        command=lambda: show_solution(GRID, CELL_SIZE, canvas, IMAGE),
+    ).pack(pady=(20, 5))
+    ttk.Button(
+        window,
+        text="Animate",
+        command=lambda: animate_solution(GRID, CELL_SIZE, canvas, IMAGE),
+    ).pack()
 
     window.mainloop()
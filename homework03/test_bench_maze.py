@@ -0,0 +1,34 @@
+"""Unit tests for bench_maze module."""
+
+import unittest
+
+import bench_maze
+
+
+class BenchMazeTest(unittest.TestCase):
+    """Smoke tests for the maze benchmark."""
+
+    def test_bench_case(self) -> None:
+        """Test bench_case function for every operation."""
+        for operation in bench_maze.OPERATIONS:
+            with self.subTest(operation=operation):
+                result = bench_maze.bench_case(operation, 15, seed=1)
+                self.assertGreaterEqual(result["seconds"], 0)
+                self.assertGreater(result["peak_mb"], 0)
+        self.assertNotIn("peak_mb", bench_maze.bench_case("bin_tree_maze", 15, seed=1, memory=False))
+        with self.assertRaises(ValueError):
+            bench_maze.bench_case("unknown", 15, seed=1)
+
+    def test_run(self) -> None:
+        """Test run function."""
+        results = bench_maze.run(["solve_maze/bfs", "shortest_path"], [21, 15], seed=1, timeout=30)
+        self.assertEqual({"solve_maze/bfs", "shortest_path"}, set(results))
+        self.assertEqual(["15", "21"], list(results["shortest_path"]))
+        self.assertIn("seconds", results["solve_maze/bfs"]["21"])
+
+        results = bench_maze.run(["solve_maze/wavefront"], [1001, 2001], seed=1, timeout=0.5)
+        self.assertEqual({"1001": {"timeout": 0.5}}, results["solve_maze/wavefront"])
+
+
+if __name__ == "__main__":
+    unittest.main()
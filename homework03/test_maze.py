@@ -1,9 +1,17 @@
 """Unit tests for maze module."""
 
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+from copy import deepcopy
+from itertools import islice
 from random import seed
+from typing import Dict
 
 import maze
+import numpy as np
 
 
 class MazeTest(unittest.TestCase):
@@ -349,6 +357,413 @@ class MazeTest(unittest.TestCase):
             maze.shortest_path(grid_3, second_exit_3),
         )
 
+    def test_find_path(self) -> None:
+        """Test find_path function with every search method."""
+        grid = [
+            ["■", "■", "■", "■", "■"],
+            ["■", " ", " ", " ", "■"],
+            ["■", "■", "■", " ", "■"],
+            ["X", " ", " ", " ", "■"],
+            ["■", "■", "■", "X", "■"],
+        ]
+        for method in maze.SEARCH_METHODS:
+            with self.subTest(method=method):
+                path_, expanded = maze.find_path(grid, (3, 0), (4, 3), method)
+                self.assertEqual([(4, 3), (3, 3), (3, 2), (3, 1), (3, 0)], path_)
+                self.assertGreaterEqual(expanded, 4)
+                self.assertEqual([(3, 0)], maze.find_path(grid, (3, 0), (3, 0), method)[0])
+
+        grid[3][2] = "■"
+        for method in maze.SEARCH_METHODS:
+            with self.subTest(method=method):
+                self.assertIsNone(maze.find_path(grid, (3, 0), (4, 3), method)[0])
+
+        with self.assertRaises(ValueError):
+            maze.find_path(grid, (3, 0), (4, 3), "unknown")
+
+    def test_solve_maze_methods(self) -> None:
+        """Test that bfs and wavefront methods of solve_maze find the same path."""
+        for seed_ in range(30):
+            with self.subTest(seed=seed_):
+                seed(seed_)
+                grid = maze.bin_tree_maze(11, 15)
+                _, wavefront_path = maze.solve_maze(deepcopy(grid), method="wavefront")
+                for method in maze.SEARCH_METHODS:
+                    _, path_ = maze.solve_maze(deepcopy(grid), method=method)
+                    self.assertEqual(wavefront_path, path_)
+
+        with self.assertRaises(ValueError):
+            maze.solve_maze(maze.bin_tree_maze(5, 5, random_exit=False), method="unknown")
+
+    def test_find_path_in_open_grid(self) -> None:
+        """Test that every search method finds a shortest path when there are many of them."""
+        grid = [[" "] * 9 for _ in range(7)]
+        grid[3][1:8] = ["■"] * 7
+        for start, goal, length in [((0, 0), (6, 8), 15), ((6, 4), (0, 4), 15), ((2, 2), (2, 6), 5)]:
+            for method in maze.SEARCH_METHODS:
+                with self.subTest(method=method, start=start, goal=goal):
+                    path_, _ = maze.find_path(grid, start, goal, method)
+                    self.assertEqual(length, len(path_))
+                    self.assertEqual((goal, start), (path_[0], path_[-1]))
+                    for (y1, x1), (y2, x2) in zip(path_, path_[1:]):
+                        self.assertEqual(1, abs(y1 - y2) + abs(x1 - x2))
+                        self.assertNotEqual("■", grid[y2][x2])
+
+    def test_find_path_expands_fewer_cells(self) -> None:
+        """Test that A* and bidirectional search expand fewer cells than BFS."""
+        seed(34)
+        grid = maze.bin_tree_maze(101, 101)
+        start, goal = maze.get_exits(grid)
+        _, bfs_expanded = maze.find_path(grid, start, goal, "bfs")
+        for method in ["astar", "bidirectional"]:
+            with self.subTest(method=method):
+                self.assertLess(maze.find_path(grid, start, goal, method)[1], bfs_expanded)
+
+        for method in maze.SEARCH_METHODS:
+            with self.subTest(method=method):
+                stats: Dict[str, int] = {}
+                _, path_ = maze.solve_maze(grid, method, stats=stats)
+                self.assertEqual(maze.find_path(grid, start, goal, method), (path_, stats["expanded"]))
+        stats = {}
+        maze.solve_maze(grid, "wavefront", stats=stats)
+        self.assertEqual({}, stats)
+
+    def test_maze_grid(self) -> None:
+        """Test MazeGrid conversions and bin_tree_maze_compact function."""
+        for rows, cols in [(5, 5), (15, 15), (8, 11)]:
+            seed(rows * cols)
+            grid = maze.bin_tree_maze(rows, cols)
+            seed(rows * cols)
+            compact = maze.bin_tree_maze_compact(rows, cols)
+            self.assertEqual(grid, compact.to_list())
+            self.assertEqual(compact, maze.MazeGrid.from_list(grid))
+            self.assertEqual(rows * cols, len(compact.cells))
+            self.assertEqual(maze.get_exits(grid), maze.get_exits(compact))
+
+    def test_solve_maze_compact(self) -> None:
+        """Test solve_maze function on MazeGrid."""
+        for i in range(30):
+            seed(i)
+            grid = maze.bin_tree_maze(15, 15)
+            compact = maze.MazeGrid.from_list(grid)
+            solved, path_ = maze.solve_maze(grid, method="wavefront")
+            compact_solved, compact_path = maze.solve_maze(compact)
+            self.assertEqual(path_, compact_path)
+            self.assertEqual(solved, compact_solved.to_list())
+            self.assertIsNone(compact.distance)
+            self.assertEqual(maze.MazeGrid.from_list(grid), compact)
+
+        compact = maze.MazeGrid.from_list(
+            [
+                ["■", "■", "■", "■", "■"],
+                ["X", " ", "■", " ", "X"],
+                ["■", "■", "■", "■", "■"],
+            ]
+        )
+        self.assertIsNone(maze.solve_maze(compact)[1])
+        with self.assertRaises(ValueError):
+            maze.solve_maze(compact, method="astar")
+
+    def test_bin_tree_maze_numpy(self) -> None:
+        """Test bin_tree_maze_numpy function."""
+        for rows, cols in [(5, 5), (15, 15), (21, 35)]:
+            compact = maze.bin_tree_maze_numpy(rows, cols, seed=rows * cols)
+            self.assertEqual(compact, maze.bin_tree_maze_numpy(rows, cols, seed=rows * cols))
+            grid = compact.to_list()
+            self.assertEqual(2, len(maze.get_exits(grid)))
+            self.assertTrue(all(grid[y][x] == " " for y in range(1, rows, 2) for x in range(1, cols, 2)))
+            self.assertTrue(all(grid[0][x] in "■X" and grid[rows - 1][x] in "■X" for x in range(cols)))
+            self.assertTrue(all(grid[y][0] in "■X" and grid[y][cols - 1] in "■X" for y in range(rows)))
+
+            # Binary Tree даёт совершенный лабиринт: из первой клетки достижимы все,
+            # а проходов между клетками на один меньше, чем клеток
+            open_cells = sum(row.count(" ") for row in grid)
+            odd_cells = len(range(1, rows, 2)) * len(range(1, cols, 2))
+            self.assertEqual(2 * odd_cells - 1, open_cells)
+            for y in range(1, rows, 2):
+                for x in range(1, cols, 2):
+                    self.assertIsNotNone(maze.bfs_path(grid, (1, 1), (y, x))[0])
+
+        fixed = maze.bin_tree_maze_numpy(5, 5, random_exit=False, seed=1).to_list()
+        self.assertEqual([(0, 3), (4, 1)], maze.get_exits(fixed))
+        self.assertEqual(["■", " ", " ", " ", "■"], fixed[1])
+
+    def test_generate_maze(self) -> None:
+        """Test generate_maze function with every algorithm."""
+        for algorithm in maze.GENERATORS:
+            for rows, cols in [(3, 3), (15, 15), (21, 35)]:
+                with self.subTest(algorithm=algorithm, rows=rows, cols=cols):
+                    compact = maze.generate_maze(rows, cols, algorithm, random_exit=False, seed=rows + cols)
+                    self.assertEqual(compact, maze.generate_maze(rows, cols, algorithm, False, rows + cols))
+                    grid = compact.to_list()
+                    self.assertEqual([(0, cols - 2), (rows - 1, 1)], maze.get_exits(grid))
+
+                    cells = [(y, x) for y in range(1, rows - 1, 2) for x in range(1, cols - 1, 2)]
+                    self.assertTrue(all(grid[y][x] == " " for y, x in cells))
+                    self.assertEqual(2 * len(cells) - 1, sum(row.count(" ") for row in grid))
+                    for cell in cells:
+                        self.assertIsNotNone(maze.bfs_path(grid, (1, 1), cell)[0])
+
+                    _, path_ = maze.solve_maze(compact)
+                    self.assertEqual(path_, maze.solve_maze(grid)[1])
+
+        for algorithm in ["backtracker", "kruskal", "wilson", "eller"]:
+            grid = maze.generate_maze(16, 12, algorithm, random_exit=False, seed=1).to_list()
+            self.assertEqual(["■"] * 12, grid[14])
+            self.assertTrue(all(row[10] == row[11] == "■" for row in grid[1:]))
+
+        with self.assertRaises(ValueError):
+            maze.generate_maze(algorithm="unknown")
+
+    def test_eller_rows(self) -> None:
+        """Test eller_rows and write_rows functions."""
+        rows = list(islice(maze.eller_rows(21, seed=38), 1001))
+        self.assertEqual(1001, len(rows))
+        self.assertTrue(all(len(row) == 21 for row in rows))
+        self.assertEqual(rows, list(islice(maze.eller_rows(21, seed=38), 1001)))
+        self.assertEqual(rows[:2], list(maze.eller_rows(21, 1001, seed=38))[:2])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "maze.txt")
+            self.assertEqual(15, maze.write_rows(maze.eller_rows(21, 15, seed=38), path))
+            with open(path, encoding="utf-8") as file:
+                grid = [list(line.rstrip("\n")) for line in file]
+        self.assertEqual(maze.MazeGrid(15, 21, bytearray().join(maze.eller_rows(21, 15, seed=38))).to_list(), grid)
+        self.assertEqual(2 * 70 - 1, sum(row.count(" ") for row in grid))
+
+    def test_add_path_to_grid(self) -> None:
+        """Test add_path_to_grid, add_path_to_compact and path_to_array functions."""
+        grid = [
+            ["■", "■", "■", "■", "■"],
+            ["X", " ", " ", " ", "■"],
+            ["■", "■", "■", " ", "■"],
+            ["■", "■", "■", "X", "■"],
+        ]
+        expected = [
+            ["■", "■", "■", "■", "■"],
+            ["X", "X", "X", "X", "■"],
+            ["■", "■", "■", "X", "■"],
+            ["■", "■", "■", "X", "■"],
+        ]
+        _, path_ = maze.solve_maze(deepcopy(grid))
+        points = maze.path_to_array(path_)
+        self.assertEqual((6, 2), points.shape)
+        self.assertEqual(path_, [tuple(point) for point in points.tolist()])
+        self.assertEqual((0, 2), maze.path_to_array(None).shape)
+        self.assertEqual([[1, 0]], maze.path_to_array((1, 0)).tolist())
+
+        self.assertEqual(expected, maze.add_path_to_grid(deepcopy(grid), path_))
+        self.assertEqual(expected, maze.add_path_to_grid(deepcopy(grid), points))
+        self.assertEqual(grid, maze.add_path_to_grid(deepcopy(grid), None))
+        compact = maze.add_path_to_compact(maze.MazeGrid.from_list(grid), points)
+        self.assertEqual(expected, compact.to_list())
+
+    def test_maze_solver(self) -> None:
+        """Test MazeSolver class and that solve_maze keeps the grid intact."""
+        seed(40)
+        grid = maze.bin_tree_maze(21, 21, random_exit=False)
+        original = deepcopy(grid)
+        solver = maze.MazeSolver(grid)
+        cells = [(y, x) for y in range(1, 21, 2) for x in range(1, 21, 2)]
+        for start, goal in zip(cells, cells[7:] + cells[:7]):
+            self.assertEqual(maze.bfs_path(grid, start, goal)[0], solver.shortest_path(start, goal))
+        self.assertEqual(len(cells), solver.query)
+        self.assertIsNone(solver.shortest_path((1, 1), (0, 0)))
+
+        compact_solver = maze.MazeSolver(maze.MazeGrid.from_list(grid))
+        exits = maze.get_exits(grid)
+        self.assertEqual(maze.solve_maze(grid)[1], compact_solver.shortest_path(exits[0], exits[1]))
+
+        for method in ["wavefront", *maze.SEARCH_METHODS]:
+            maze.solve_maze(grid, method=method)
+            self.assertEqual(original, grid)
+
+    def test_maze_tree_index(self) -> None:
+        """Test MazeTreeIndex class."""
+        for algorithm in maze.GENERATORS:
+            with self.subTest(algorithm=algorithm):
+                grid = maze.generate_maze(15, 21, algorithm, random_exit=False, seed=41).to_list()
+                index = maze.MazeTreeIndex(grid)
+                cells = [(y, x) for y in range(15) for x in range(21) if grid[y][x] != "■"]
+                for start in cells[::5]:
+                    for goal in cells[::7]:
+                        path_ = maze.bfs_path(grid, start, goal)[0]
+                        self.assertEqual(path_, index.path(start, goal))
+                        self.assertEqual(len(path_) - 1, index.distance(start, goal))
+
+        grid = [
+            ["■", "■", "■", "■", "■"],
+            ["■", " ", "■", " ", "■"],
+            ["■", " ", "■", " ", "■"],
+        ]
+        index = maze.MazeTreeIndex(grid)
+        self.assertEqual((1, 1), index.lca((1, 1), (2, 1)))
+        self.assertIsNone(index.distance((1, 1), (1, 3)))
+        self.assertIsNone(index.path((2, 1), (2, 3)))
+        self.assertEqual([(2, 3), (1, 3)], index.path((1, 3), (2, 3)))
+
+        with self.assertRaises(ValueError):
+            maze.MazeTreeIndex([[" ", " "], [" ", " "]])
+
+    def test_maze_tree_index_random_exits(self) -> None:
+        """Test MazeTreeIndex class on bin_tree_maze with random exits that close loops."""
+        for rows, cols in [(11, 11), (10, 10), (12, 9)]:
+            looped = 0
+            for maze_seed in range(150):
+                seed(maze_seed)
+                grid = maze.bin_tree_maze(rows, cols)
+                index = maze.MazeTreeIndex(grid)
+                looped += bool(index.shortcuts)
+                open_cells = [(y, x) for y in range(rows) for x in range(cols) if grid[y][x] == " "]
+                cells = maze.get_exits(grid) + open_cells[::9]
+                for start in cells:
+                    for goal in cells:
+                        with self.subTest(size=(rows, cols), seed=maze_seed, start=start, goal=goal):
+                            path_, expected = index.path(start, goal), maze.bfs_path(grid, start, goal)[0]
+                            if expected is None:
+                                self.assertIsNone(path_)
+                                continue
+                            self.assertEqual(len(expected), len(path_))
+                            self.assertEqual(len(path_) - 1, index.distance(start, goal))
+                            self.assertEqual((goal, start), (path_[0], path_[-1]))
+                            for (y, x), (next_y, next_x) in zip(path_, path_[1:]):
+                                self.assertEqual(1, abs(y - next_y) + abs(x - next_x))
+                                self.assertNotEqual("■", grid[next_y][next_x])
+            self.assertGreater(looped, 0)
+
+    def test_render_maze(self) -> None:
+        """Test render_maze function."""
+        grid = [
+            ["■", "X", "■"],
+            ["■", " ", "■"],
+            ["■", "X", "■"],
+        ]
+        self.assertEqual("■X■\n■ ■\n■X■", maze.render_maze(grid))
+        self.assertEqual("■X■\n■X■\n■X■", maze.render_maze(grid, [(2, 1), (1, 1), (0, 1)]))
+        self.assertEqual(maze.render_maze(grid), maze.render_maze(maze.MazeGrid.from_list(grid)))
+        self.assertEqual("■X■\n■ ■\n■ ■", maze.render_maze(maze.solve_maze(grid, method="wavefront")[0], (0, 1)))
+
+    def test_import_does_not_load_heavy_modules(self) -> None:
+        """Test that importing maze loads neither numpy nor pandas."""
+        code = "import sys, maze; print(sorted({'numpy', 'pandas'} & set(sys.modules)))"
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.abspath(maze.__file__)),
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual("[]", output.stdout.strip())
+
+    def test_bfs_frontier(self) -> None:
+        """Test bfs_frontier generator."""
+        seed(44)
+        grid = maze.bin_tree_maze(21, 21, random_exit=False)
+        start, goal = maze.get_exits(grid)
+        steps = maze.bfs_frontier(grid, start, goal, batch=10)
+        batches = []
+        with self.assertRaises(StopIteration) as stop:
+            while True:
+                batches.append(next(steps))
+        path_, expanded = maze.bfs_path(grid, start, goal)
+        self.assertEqual(path_, stop.exception.value)
+        self.assertTrue(all(0 < len(batch) <= 10 for batch in batches))
+        cells = [cell for batch in batches for cell in batch]
+        self.assertEqual(expanded, len(cells))
+        self.assertEqual((start, goal), (cells[0], cells[-1]))
+
+        grid[1][19] = "■"
+        steps = maze.bfs_frontier(grid, start, goal)
+        with self.assertRaises(StopIteration) as stop:
+            while True:
+                next(steps)
+        self.assertIsNone(stop.exception.value)
+
+    def test_save_and_load_maze(self) -> None:
+        """Test save_maze, load_maze functions and PackedMaze class."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "maze.bin")
+            for rows, cols in [(5, 5), (15, 21), (16, 13)]:
+                seed(rows * cols)
+                grid = maze.bin_tree_maze(rows, cols)
+                size = maze.save_maze(grid, path)
+                self.assertEqual(os.path.getsize(path), size)
+                self.assertEqual(17 + 8 * len(maze.get_exits(grid)) + (rows * cols + 7) // 8, size)
+                self.assertEqual(grid, maze.load_maze(path).to_list())
+
+                with maze.PackedMaze(path) as packed:
+                    self.assertEqual((rows, cols), (packed.rows, packed.cols))
+                    self.assertEqual(maze.get_exits(grid), packed.exits)
+                    for y in range(rows):
+                        for x in range(cols):
+                            self.assertEqual(grid[y][x] != "■", packed.passable(y, x))
+
+            compact = maze.generate_maze(31, 31, "wilson", seed=45)
+            maze.save_maze(compact, path)
+            self.assertEqual(compact, maze.load_maze(path))
+
+            with open(path, "r+b") as file:
+                file.write(b"ZAME")
+            with self.assertRaises(ValueError):
+                maze.load_maze(path)
+
+    def test_generate_and_solve_batch(self) -> None:
+        """Test generate_and_solve_batch function."""
+        jobs = [(seed_, 5 + 2 * (seed_ % 4), 7 + 2 * (seed_ % 3)) for seed_ in range(20)]
+        batch = maze.generate_and_solve_batch(jobs, "kruskal", processes=2)
+        self.assertEqual(20, len(batch.grids))
+        self.assertGreater(batch.mazes_per_second, 0)
+        for (seed_, rows, cols), grid, points in zip(jobs, batch.grids, batch.paths):
+            expected = maze.generate_maze(rows, cols, "kruskal", seed=seed_)
+            self.assertEqual(expected, grid)
+            path_ = maze.solve_maze(expected)[1]
+            if path_ is None:
+                self.assertIsNone(points)
+            else:
+                self.assertEqual(maze.path_to_array(path_).tolist(), points.tolist())
+
+        self.assertEqual([], maze.generate_and_solve_batch([], processes=1).grids)
+        with self.assertRaises(ValueError):
+            maze.generate_and_solve_batch(jobs, "unknown")
+
+    def test_dijkstra_path(self) -> None:
+        """Test dijkstra_path function and solve_maze with weights."""
+        grid = [[" "] * 7 for _ in range(5)]
+        weights = [[1] * 7 for _ in range(5)]
+        for y in range(4):
+            weights[y][3] = 10
+        path_, cost = maze.dijkstra_path(grid, (0, 0), (0, 6), weights)
+        self.assertEqual(14, cost)
+        self.assertIn((4, 3), path_)
+        self.assertEqual(((0, 6), (0, 0)), (path_[0], path_[-1]))
+        self.assertEqual(cost, sum(weights[y][x] for y, x in path_[:-1]))
+        self.assertEqual((path_, cost), maze.dijkstra_path(maze.MazeGrid.from_list(grid), (0, 0), (0, 6), weights))
+
+        flat = [w for row in weights for w in row]
+        grid[4][3] = "■"
+        self.assertEqual(15, maze.dijkstra_path(grid, (0, 0), (0, 6), flat)[1])
+        grid[0][3] = grid[1][3] = grid[2][3] = grid[3][3] = "■"
+        self.assertEqual((None, None), maze.dijkstra_path(grid, (0, 0), (0, 6), flat))
+
+        with self.assertRaises(ValueError):
+            maze.dijkstra_path(grid, (0, 0), (0, 6), flat[1:])
+        with self.assertRaises(ValueError):
+            maze.dijkstra_path(grid, (0, 0), (0, 6), [-1] * 35)
+        with self.assertRaises(ValueError):
+            maze.dijkstra_path(grid, (0, 0), (0, 6), [1.5] * 35)
+
+        grid = [[" "] * 7 for _ in range(5)]
+        matrix = np.array(weights, dtype=np.int32)
+        self.assertEqual((path_, cost), maze.dijkstra_path(grid, (0, 0), (0, 6), matrix))
+        self.assertEqual((path_, cost), maze.dijkstra_path(grid, (0, 0), (0, 6), matrix.ravel()))
+        self.assertEqual(cost, maze.dijkstra_path(grid, (0, 0), (0, 6), matrix.astype(np.uint8))[1])
+
+        for seed_ in range(10):
+            seed(seed_)
+            grid = maze.bin_tree_maze(15, 15, random_exit=False)
+            _, path_ = maze.solve_maze(grid)
+            self.assertEqual(path_, maze.solve_maze(grid, weights=[[1] * 15 for _ in range(15)])[1])
+
 
 if __name__ == "__main__":
     unittest.main()
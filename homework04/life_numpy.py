@@ -0,0 +1,132 @@
+import pathlib
+import random
+import typing as tp
+
+import numpy as np
+
+Cell = tp.Tuple[int, int]
+Cells = tp.List[int]
+Grid = tp.List[Cells]
+
+
+class NumpyGameOfLife:
+    """
+    Игра «Жизнь» на массивах NumPy: поколение хранится как uint8-матрица, число соседей
+    считается суммой восьми сдвигов поля, окружённого рамкой из мёртвых клеток.
+    Границы не замыкаются, как и в GameOfLife.
+    """
+
+    def __init__(
+        self,
+        size: tp.Tuple[int, int],
+        randomize: bool = True,
+        max_generations: tp.Optional[float] = float("inf"),
+    ) -> None:
+        # Размер клеточного поля
+        self.rows, self.cols = size
+        # Поле с рамкой в одну мёртвую клетку и буфер для числа соседей, выделяются один раз
+        self._padded = np.zeros((self.rows + 2, self.cols + 2), dtype=np.uint8)
+        self._counts = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        # Предыдущее поколение клеток
+        self.prev_generation = self.create_grid()
+        # Текущее поколение клеток
+        self.curr_generation = self.create_grid(randomize=randomize)
+        # Максимальное число поколений
+        self.max_generations = max_generations
+        # Текущее число поколений
+        self.generations = 1
+
+    @property
+    def curr_generation(self) -> np.ndarray:
+        return self._curr_generation
+
+    @curr_generation.setter
+    def curr_generation(self, grid: tp.Union[Grid, np.ndarray]) -> None:
+        self._curr_generation = np.asarray(grid, dtype=np.uint8)
+
+    @property
+    def prev_generation(self) -> np.ndarray:
+        return self._prev_generation
+
+    @prev_generation.setter
+    def prev_generation(self, grid: tp.Union[Grid, np.ndarray]) -> None:
+        self._prev_generation = np.asarray(grid, dtype=np.uint8)
+
+    def create_grid(self, randomize: bool = False) -> np.ndarray:
+        """
+        Создать поле: случайное, если randomize, иначе из мёртвых клеток.
+        Случайное поле зависит от состояния модуля random.
+        """
+        if not randomize:
+            return np.zeros((self.rows, self.cols), dtype=np.uint8)
+        rng = np.random.default_rng(random.getrandbits(64))
+        return rng.integers(0, 2, size=(self.rows, self.cols), dtype=np.uint8)
+
+    def get_neighbours(self, cell: Cell) -> Cells:
+        """
+        Вернуть состояния соседей клетки, как GameOfLife.get_neighbours.
+        """
+        row, col = cell
+        window = self.curr_generation[max(0, row - 1) : row + 2, max(0, col - 1) : col + 2]
+        mask = np.ones(window.shape, dtype=bool)
+        mask[row - max(0, row - 1), col - max(0, col - 1)] = False
+        return window[mask].tolist()
+
+    def count_neighbours(self) -> np.ndarray:
+        """
+        Посчитать живых соседей всех клеток сразу.
+        """
+        padded, counts = self._padded, self._counts
+        padded[1:-1, 1:-1] = self.curr_generation
+        np.add(padded[:-2, :-2], padded[:-2, 1:-1], out=counts)
+        for dy, dx in [(0, 2), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)]:
+            counts += padded[dy : dy + self.rows, dx : dx + self.cols]
+        return counts
+
+    def get_next_generation(self) -> np.ndarray:
+        """
+        Получить следующее поколение клеток.
+        """
+        counts = self.count_neighbours()
+        alive = counts == 3
+        alive |= (counts == 2) & (self.curr_generation == 1)
+        return alive.view(np.uint8)
+
+    def step(self) -> None:
+        """
+        Выполнить один шаг игры.
+        """
+        self.prev_generation, self.curr_generation = self.curr_generation, self.get_next_generation()
+        self.generations += 1
+
+    @property
+    def is_max_generations_exceeded(self) -> bool:
+        """
+        Не превысило ли текущее число поколений максимально допустимое.
+        """
+        return self.max_generations is not None and self.generations >= self.max_generations
+
+    @property
+    def is_changing(self) -> bool:
+        """
+        Изменилось ли состояние клеток с предыдущего шага.
+        """
+        return not np.array_equal(self.prev_generation, self.curr_generation)
+
+    @staticmethod
+    def from_file(filename: pathlib.Path) -> "NumpyGameOfLife":
+        """
+        Прочитать состояние клеток из указанного файла.
+        """
+        lines = [line.strip() for line in pathlib.Path(filename).read_text().splitlines() if line.strip()]
+        grid = np.array([[int(c) for c in line] for line in lines], dtype=np.uint8)
+        game = NumpyGameOfLife((grid.shape[0], grid.shape[1]), randomize=False)
+        game.curr_generation = grid
+        return game
+
+    def save(self, filename: pathlib.Path) -> None:
+        """
+        Сохранить текущее состояние клеток в указанный файл.
+        """
+        lines = ["".join(map(str, row)) for row in self.curr_generation.tolist()]
+        pathlib.Path(filename).write_text("\n".join(lines) + "\n")
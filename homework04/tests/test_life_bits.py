@@ -0,0 +1,117 @@
+import json
+import os
+import random
+import tracemalloc
+import unittest
+
+import life_bits
+import life_numpy
+
+
+class TestBitGameOfLife(unittest.TestCase):
+    def setUp(self):
+        self.grid = [
+            [1, 1, 0, 0, 1, 1, 1, 1],
+            [0, 1, 1, 1, 1, 1, 1, 0],
+            [1, 0, 1, 1, 0, 0, 0, 0],
+            [1, 0, 0, 0, 0, 0, 0, 1],
+            [1, 0, 1, 1, 1, 1, 0, 0],
+            [1, 1, 1, 1, 0, 1, 1, 1],
+        ]
+        self.rows = 6
+        self.cols = 8
+        self.max_generations = 18
+
+    def test_pack_and_unpack(self):
+        for rows, cols in [(1, 1), (3, 63), (2, 64), (4, 65), (5, 130)]:
+            game = life_bits.BitGameOfLife((rows, cols), randomize=False)
+            grid = [[random.randint(0, 1) for _ in range(cols)] for _ in range(rows)]
+            game.curr_generation = grid
+            self.assertEqual((rows, (cols + 63) // 64), game.curr_words.shape)
+            self.assertEqual(grid, game.curr_generation.tolist())
+            self.assertEqual(grid[0][0], int(game.curr_words[0, 0]) & 1)
+
+    def test_can_update(self):
+        game = life_bits.BitGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+
+        tests_dir = os.path.dirname(__file__)
+        steps_path = os.path.join(tests_dir, "steps.txt")
+        with open(steps_path) as f:
+            steps = json.load(f)
+
+        num_updates = 0
+        for step in sorted(steps.keys(), key=int):
+            with self.subTest(step=step):
+                for _ in range(int(step) - num_updates):
+                    game.curr_words = game.get_next_generation()
+                    num_updates += 1
+                self.assertEqual(steps[step], game.curr_generation.tolist())
+
+    def test_matches_numpy_engine(self):
+        random.seed(50)
+        for rows, cols in [(1, 1), (7, 63), (9, 64), (11, 65), (33, 200)]:
+            with self.subTest(rows=rows, cols=cols):
+                game = life_bits.BitGameOfLife((rows, cols))
+                reference = life_numpy.NumpyGameOfLife((rows, cols), randomize=False)
+                reference.curr_generation = game.curr_generation
+                for _ in range(10):
+                    game.step()
+                    reference.step()
+                    self.assertEqual(reference.curr_generation.tolist(), game.curr_generation.tolist())
+
+    def test_matches_numpy_engine_across_bands(self):
+        random.seed(51)
+        game = life_bits.BitGameOfLife((200, 12801))
+        self.assertLess(game._halo.shape[0], game.rows)
+        reference = life_numpy.NumpyGameOfLife((200, 12801), randomize=False)
+        reference.curr_generation = game.curr_generation
+        for _ in range(3):
+            game.step()
+            reference.step()
+            self.assertTrue((reference.curr_generation == game.curr_generation).all())
+
+    def test_uses_eight_times_less_memory(self):
+        game = life_bits.BitGameOfLife((1024, 8192))
+        reference = life_numpy.NumpyGameOfLife((1024, 8192))
+        self.assertEqual(reference.curr_generation.nbytes, 8 * game.curr_words.nbytes)
+
+        tracemalloc.start()
+        try:
+            game.step()
+            game.step()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, game.curr_words.nbytes // 8)
+        buffers = [game.curr_words, game.prev_words, game._halo, game._shift, game._spill, *game._counter]
+        engine = sum(buffer.nbytes for buffer in buffers)
+        self.assertLess(engine, reference.curr_generation.nbytes // 2)
+
+    def test_prev_generation_is_correct(self):
+        game = life_bits.BitGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        game.step()
+        self.assertEqual(self.grid, game.prev_generation.tolist())
+
+    def test_is_max_generations_exceeded(self):
+        max_generations = 4
+        game = life_bits.BitGameOfLife((self.rows, self.cols), max_generations=max_generations)
+        game.curr_generation = self.grid
+        for _ in range(max_generations - 1):
+            game.step()
+        self.assertEqual(game.generations, max_generations)
+        self.assertTrue(game.is_max_generations_exceeded)
+
+    def test_is_changing(self):
+        game = life_bits.BitGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        game.step()
+        self.assertTrue(game.is_changing)
+
+    def test_is_not_changing(self):
+        game = life_bits.BitGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        for _ in range(self.max_generations + 1):
+            game.step()
+        self.assertFalse(game.is_changing)
@@ -0,0 +1,137 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+
+import life_numpy
+
+
+def reference_next_generation(grid):
+    rows, cols = len(grid), len(grid[0])
+    result = []
+    for row in range(rows):
+        line = []
+        for col in range(cols):
+            alive = sum(
+                grid[r][c]
+                for r in range(max(0, row - 1), min(rows, row + 2))
+                for c in range(max(0, col - 1), min(cols, col + 2))
+                if (r, c) != (row, col)
+            )
+            line.append(1 if alive == 3 or (alive == 2 and grid[row][col]) else 0)
+        result.append(line)
+    return result
+
+
+class TestNumpyGameOfLife(unittest.TestCase):
+    def setUp(self):
+        self.grid = [
+            [1, 1, 0, 0, 1, 1, 1, 1],
+            [0, 1, 1, 1, 1, 1, 1, 0],
+            [1, 0, 1, 1, 0, 0, 0, 0],
+            [1, 0, 0, 0, 0, 0, 0, 1],
+            [1, 0, 1, 1, 1, 1, 0, 0],
+            [1, 1, 1, 1, 0, 1, 1, 1],
+        ]
+        self.rows = 6
+        self.cols = 8
+        self.max_generations = 18
+
+    def test_can_create_an_empty_grid(self):
+        game = life_numpy.NumpyGameOfLife((3, 3))
+        grid = game.create_grid(randomize=False)
+        self.assertEqual([[0, 0, 0], [0, 0, 0], [0, 0, 0]], grid.tolist())
+
+    def test_can_create_a_random_grid(self):
+        game = life_numpy.NumpyGameOfLife((30, 40))
+        random.seed(12345)
+        grid = game.create_grid(randomize=True)
+        random.seed(12345)
+        self.assertEqual(grid.tolist(), game.create_grid(randomize=True).tolist())
+        self.assertEqual((30, 40), grid.shape)
+        self.assertTrue(set(grid.ravel().tolist()) <= {0, 1})
+
+    def test_get_neighbours(self):
+        game = life_numpy.NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        for cell, count, alive in [
+            ((2, 3), 8, 4),
+            ((0, 0), 3, 2),
+            ((0, 7), 3, 2),
+            ((5, 0), 3, 2),
+            ((5, 7), 3, 1),
+            ((0, 3), 5, 4),
+            ((5, 3), 5, 4),
+            ((2, 0), 5, 2),
+            ((2, 7), 5, 2),
+        ]:
+            with self.subTest(cell=cell):
+                neighbours = game.get_neighbours(cell)
+                self.assertEqual(count, len(neighbours))
+                self.assertEqual(alive, sum(neighbours))
+
+    def test_can_update(self):
+        game = life_numpy.NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+
+        tests_dir = os.path.dirname(__file__)
+        steps_path = os.path.join(tests_dir, "steps.txt")
+        with open(steps_path) as f:
+            steps = json.load(f)
+
+        num_updates = 0
+        for step in sorted(steps.keys(), key=int):
+            with self.subTest(step=step):
+                for _ in range(int(step) - num_updates):
+                    game.curr_generation = game.get_next_generation()
+                    num_updates += 1
+                self.assertEqual(steps[step], game.curr_generation.tolist())
+
+    def test_matches_reference_on_random_boards(self):
+        random.seed(49)
+        for rows, cols in [(1, 1), (1, 9), (17, 23), (40, 3)]:
+            game = life_numpy.NumpyGameOfLife((rows, cols))
+            for _ in range(5):
+                expected = reference_next_generation(game.curr_generation.tolist())
+                game.step()
+                self.assertEqual(expected, game.curr_generation.tolist())
+
+    def test_prev_generation_is_correct(self):
+        game = life_numpy.NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        game.step()
+        self.assertEqual(self.grid, game.prev_generation.tolist())
+
+    def test_is_max_generations_exceeded(self):
+        max_generations = 4
+        game = life_numpy.NumpyGameOfLife((self.rows, self.cols), max_generations=max_generations)
+        game.curr_generation = self.grid
+        for _ in range(max_generations - 1):
+            game.step()
+        self.assertEqual(game.generations, max_generations)
+        self.assertTrue(game.is_max_generations_exceeded)
+
+    def test_is_changing(self):
+        game = life_numpy.NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        game.step()
+        self.assertTrue(game.is_changing)
+
+    def test_is_not_changing(self):
+        game = life_numpy.NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        for _ in range(self.max_generations + 1):
+            game.step()
+        self.assertFalse(game.is_changing)
+
+    def test_save_and_from_file(self):
+        game = life_numpy.NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "grid.txt")
+            game.save(path)
+            self.assertEqual(self.grid, life_numpy.NumpyGameOfLife.from_file(path).curr_generation.tolist())
+        glider = life_numpy.NumpyGameOfLife.from_file(os.path.join(os.path.dirname(__file__), "..", "glider.txt"))
+        self.assertEqual((5, 5), (glider.rows, glider.cols))
+        self.assertEqual(5, int(glider.curr_generation.sum()))